@@ -6,6 +6,7 @@ from backend.auth.jwt_handler import verify_token
 from backend.database.audit_logger import audit_logger
 from backend.cache.robust_cache import robust_cache
 from backend.cache.redis_cache import redis_cache
+from backend.export.report_generator import report_generator
 from backend.autonomous.correlation_tracker import correlation_tracker
 from backend.autonomous.backup_manager import backup_manager
 from backend.autonomous.webhook_notifier import webhook_notifier
@@ -56,10 +57,14 @@ async def clear_cache(
     try:
         if cache_type == "all":
             await robust_cache.clear_all()
+            report_generator.clear_cache()
             logger.info("cache_cleared", cache_type="file_cache")
         elif cache_type == "orchestration":
             await robust_cache.invalidate_tag("orchestration")
+            report_generator.clear_cache()
             logger.info("cache_invalidated", tag="orchestration")
+        elif cache_type == "reports":
+            report_generator.clear_cache()
         
         return {"status": "success", "message": f"{cache_type} cache cleared"}
     except Exception as e:
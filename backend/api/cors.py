@@ -0,0 +1,100 @@
+from typing import Iterable, List, Tuple
+
+Headers = List[Tuple[bytes, bytes]]
+
+class AllowListCORSMiddleware:
+    """
+    Minimal CORS handling for a fixed set of origins.
+    
+    Origins are matched with a frozenset lookup and every header except the
+    echoed origin is encoded once at startup. Requests without an Origin
+    header (same-origin, probes, scrapers) pass straight through.
+    """
+    
+    def __init__(
+        self,
+        app,
+        allow_origins: Iterable[str],
+        allow_methods: Iterable[str] = ("DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT"),
+        max_age: int = 600,
+        exempt_prefixes: Tuple[str, ...] = ()
+    ):
+        self.app = app
+        self.allow_origins = frozenset(origin.encode("latin-1") for origin in allow_origins)
+        self.exempt_prefixes = exempt_prefixes
+        self.preflight_headers: Headers = [
+            (b"access-control-allow-credentials", b"true"),
+            (b"access-control-allow-methods", ", ".join(allow_methods).encode("latin-1")),
+            (b"access-control-max-age", str(max_age).encode("latin-1")),
+            (b"vary", b"Origin"),
+            (b"content-length", b"2"),
+            (b"content-type", b"text/plain; charset=utf-8"),
+        ]
+        self.simple_headers: Headers = [
+            (b"access-control-allow-credentials", b"true"),
+        ]
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt_prefixes):
+            await self.app(scope, receive, send)
+            return
+        
+        origin = None
+        requested_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-headers":
+                requested_headers = value
+        
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+        
+        allowed = origin in self.allow_origins
+        
+        if scope["method"] == "OPTIONS" and any(
+            name == b"access-control-request-method" for name, _ in scope["headers"]
+        ):
+            await self._preflight(send, origin if allowed else None, requested_headers)
+            return
+        
+        if not allowed:
+            await self.app(scope, receive, send)
+            return
+        
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", ()))
+                headers.append((b"access-control-allow-origin", origin))
+                headers.extend(self.simple_headers)
+                for index, (name, value) in enumerate(headers):
+                    if name == b"vary":
+                        headers[index] = (b"vary", value + b", Origin")
+                        break
+                else:
+                    headers.append((b"vary", b"Origin"))
+                message["headers"] = headers
+            await send(message)
+        
+        await self.app(scope, receive, send_with_cors)
+    
+    async def _preflight(self, send, origin, requested_headers):
+        if origin is None:
+            await send({
+                "type": "http.response.start",
+                "status": 400,
+                "headers": [
+                    (b"content-length", b"22"),
+                    (b"content-type", b"text/plain; charset=utf-8"),
+                ],
+            })
+            await send({"type": "http.response.body", "body": b"Disallowed CORS origin"})
+            return
+        
+        headers = [(b"access-control-allow-origin", origin), *self.preflight_headers]
+        if requested_headers:
+            headers.append((b"access-control-allow-headers", requested_headers))
+        
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b"OK"})
\ No newline at end of file
@@ -40,7 +40,7 @@ async def export_report(
             raise HTTPException(status_code=404, detail="Request not found")
         
         # Generate report
-        content = report_generator.generate_report(data, format, template)
+        content = await report_generator.agenerate_report(data, format, template)
         
         # Set appropriate content type and filename
         content_types = {
@@ -103,7 +103,7 @@ async def batch_export(
                 try:
                     data = await _fetch_orchestration_data(request_id)
                     if data:
-                        content = report_generator.generate_report(data, format)
+                        content = await report_generator.agenerate_report(data, format)
                         filename = f"report_{request_id}.{format}"
                         zip_file.writestr(filename, content)
                 except Exception as e:
@@ -123,6 +123,67 @@ async def batch_export(
         logger.error("batch_export_failed", error=str(e), exc_info=True)
         raise HTTPException(status_code=500, detail=f"Batch export failed: {str(e)}")
 
+@router.post("/bundle/{request_id}")
+async def export_bundle(
+    request_id: str,
+    formats: list[str]
+):
+    """
+    Export one report in several formats at once.
+    Formats are rendered concurrently and returned as a ZIP file.
+    """
+    # Case and repeats would otherwise render the same report more than once
+    formats = list(dict.fromkeys(f.lower() for f in formats))
+    unsupported = [f for f in formats if f not in report_generator.supported_formats]
+    if not formats or unsupported:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported formats: {unsupported}" if unsupported else "No formats requested"
+        )
+    
+    try:
+        import zipfile
+        import io
+        
+        data = await _fetch_orchestration_data(request_id)
+        
+        if not data:
+            raise HTTPException(status_code=404, detail="Request not found")
+        
+        contents = await report_generator.generate_many(data, formats)
+        
+        zip_buffer = io.BytesIO()
+        
+        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            for fmt, content in contents.items():
+                zip_file.writestr(f"network_report_{request_id}.{fmt}", content)
+        
+        logger.info(
+            "report_bundle_exported",
+            request_id=request_id,
+            formats=list(contents),
+            size_bytes=zip_buffer.tell()
+        )
+        
+        return Response(
+            content=zip_buffer.getvalue(),
+            media_type="application/zip",
+            headers={
+                "Content-Disposition": f"attachment; filename=network_report_{request_id}.zip"
+            }
+        )
+        
+    except HTTPException:
+        raise
+    except ImportError as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Missing required library: {str(e)}"
+        )
+    except Exception as e:
+        logger.error("bundle_export_failed", error=str(e), exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Bundle export failed: {str(e)}")
+
 @router.get("/formats")
 async def list_formats():
     """
@@ -0,0 +1,102 @@
+from collections import OrderedDict
+from email.utils import formatdate
+from typing import NamedTuple, Optional
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+# Bundler output such as app.3f9c2a1b.js never changes under the same name
+HASHED_ASSET = re.compile(r"\.[0-9a-f]{8,}\.\w+$")
+COMPRESSIBLE_PREFIXES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+class CachedAsset(NamedTuple):
+    mtime_ns: int
+    size: int
+    body: bytes
+    gzip_body: Optional[bytes]
+    headers: dict
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles that keeps small assets in memory, keyed by path and revalidated
+    against the stat result Starlette already takes, and serves a pre-gzipped
+    copy to clients that accept it.
+    """
+    
+    def __init__(self, *args, cache_size: int = 256, max_file_size: int = 512 * 1024, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_size = cache_size
+        self.max_file_size = max_file_size
+        self._assets: "OrderedDict[str, CachedAsset]" = OrderedDict()
+        self._assets_lock = threading.Lock()
+    
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200
+    ) -> Response:
+        if stat_result.st_size > self.max_file_size:
+            return super().file_response(full_path, stat_result, scope, status_code)
+        
+        asset = self._get_asset(str(full_path), stat_result)
+        request_headers = Headers(scope=scope)
+        
+        if status_code == 200 and self.is_not_modified(Headers(asset.headers), request_headers):
+            return NotModifiedResponse(Headers(asset.headers))
+        
+        headers = dict(asset.headers)
+        body = asset.body
+        if asset.gzip_body is not None:
+            headers["vary"] = "Accept-Encoding"
+            if "gzip" in request_headers.get("accept-encoding", ""):
+                body = asset.gzip_body
+                headers["content-encoding"] = "gzip"
+        
+        return Response(content=body, status_code=status_code, headers=headers)
+    
+    def _get_asset(self, path: str, stat_result: os.stat_result) -> CachedAsset:
+        with self._assets_lock:
+            asset = self._assets.get(path)
+            if asset is not None and asset.mtime_ns == stat_result.st_mtime_ns and asset.size == stat_result.st_size:
+                self._assets.move_to_end(path)
+                return asset
+        
+        with open(path, "rb") as f:
+            body = f.read()
+        
+        media_type = mimetypes.guess_type(path)[0] or "text/plain"
+        if media_type.startswith("text/"):
+            media_type += "; charset=utf-8"
+        
+        headers = {
+            "content-type": media_type,
+            "etag": f'"{hashlib.md5(body).hexdigest()}"',
+            "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+            "cache-control": "public, max-age=31536000, immutable" if HASHED_ASSET.search(path) else "no-cache"
+        }
+        
+        gzip_body = None
+        if media_type.startswith(COMPRESSIBLE_PREFIXES):
+            compressed = gzip.compress(body, compresslevel=9)
+            if len(compressed) < len(body):
+                gzip_body = compressed
+        
+        asset = CachedAsset(stat_result.st_mtime_ns, stat_result.st_size, body, gzip_body, headers)
+        
+        with self._assets_lock:
+            self._assets[path] = asset
+            self._assets.move_to_end(path)
+            while len(self._assets) > self.cache_size:
+                self._assets.popitem(last=False)
+        
+        return asset
\ No newline at end of file
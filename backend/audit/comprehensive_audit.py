@@ -1,9 +1,13 @@
 import asyncio
+import heapq
 import time
 from typing import Dict, List, Optional, Any
 import structlog
 from datetime import datetime, timedelta
 import json
+import os
+
+from backend.metrics.prometheus import metrics
 
 logger = structlog.get_logger()
 
@@ -51,6 +55,120 @@ class ComprehensiveAuditLogger:
         self.events: List[AuditEvent] = []
         self.max_events = 100000
         self.retention_days = 365
+        self.queue_size = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+        self.batch_size = int(os.getenv("AUDIT_BATCH_SIZE", "200"))
+        self.batch_interval = float(os.getenv("AUDIT_BATCH_INTERVAL", "0.1"))
+        self._queue: Optional[asyncio.Queue] = None
+        self.running = False
+        self.consumer_task = None
+    
+    async def start(self):
+        if self.running:
+            return
+        
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self.running = True
+        self.consumer_task = asyncio.create_task(self._consume_loop())
+        logger.info("audit_consumer_started", queue_size=self.queue_size)
+    
+    async def stop(self):
+        self.running = False
+        if self.consumer_task:
+            # The consumer stores the batch it was collecting before it exits
+            self.consumer_task.cancel()
+            try:
+                await self.consumer_task
+            except asyncio.CancelledError:
+                pass
+            self.consumer_task = None
+        
+        # Flush whatever was queued after the last batch
+        pending = []
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        if pending:
+            self._store_batch(pending)
+        logger.info("audit_consumer_stopped", flushed=len(pending))
+    
+    def enqueue_api_call(
+        self,
+        user_id: str,
+        tenant_id: str,
+        endpoint: str,
+        method: str,
+        status_code: int,
+        duration_ms: int,
+        ip_address: str
+    ):
+        """
+        Queue an API call event for the background consumer without awaiting.
+        Events are dropped (and counted) when the queue is full.
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+        
+        event = AuditEvent(
+            event_type="api_call",
+            user_id=user_id,
+            tenant_id=tenant_id,
+            action=method,
+            resource=endpoint,
+            details={
+                "status_code": status_code,
+                "duration_ms": duration_ms
+            },
+            ip_address=ip_address
+        )
+        
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            metrics.increment_counter('audit_drops_total', {'event_type': 'api_call'})
+    
+    async def _consume_loop(self):
+        loop = asyncio.get_running_loop()
+        batch = []
+        
+        while self.running:
+            try:
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.batch_interval
+                
+                while len(batch) < self.batch_size:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+                
+                self._store_batch(batch)
+                batch = []
+            except asyncio.CancelledError:
+                if batch:
+                    self._store_batch(batch)
+                break
+            except Exception as e:
+                logger.error("audit_consumer_error", error=str(e))
+    
+    def _store_batch(self, batch: List[AuditEvent]):
+        self.events.extend(batch)
+        
+        overflow = len(self.events) - self.max_events
+        if overflow > 0:
+            del self.events[:overflow]
+        
+        for event in batch:
+            logger.info(
+                "audit_event",
+                event_type=event.event_type,
+                user_id=event.user_id,
+                tenant_id=event.tenant_id,
+                action=event.action,
+                resource=event.resource
+            )
     
     async def log_event(
         self,
@@ -74,19 +192,7 @@ class ComprehensiveAuditLogger:
             user_agent=user_agent
         )
         
-        self.events.append(event)
-        
-        if len(self.events) > self.max_events:
-            self.events.pop(0)
-        
-        logger.info(
-            "audit_event",
-            event_type=event_type,
-            user_id=user_id,
-            tenant_id=tenant_id,
-            action=action,
-            resource=resource
-        )
+        self._store_batch([event])
     
     async def log_api_call(
         self,
@@ -171,7 +277,7 @@ class ComprehensiveAuditLogger:
         if end_time:
             filtered = [e for e in filtered if e.timestamp <= end_time]
         
-        return [e.to_dict() for e in sorted(filtered, key=lambda x: x.timestamp, reverse=True)[:limit]]
+        return [e.to_dict() for e in heapq.nlargest(limit, filtered, key=lambda x: x.timestamp)]
     
     async def generate_compliance_report(
         self,
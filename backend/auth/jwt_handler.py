@@ -1,7 +1,12 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional, Dict
+from functools import lru_cache
+from typing import Optional, Dict, Tuple
+import hashlib
 import os
-from jose import JWTError, jwt
+import threading
+import time
+from jose import JWTError, jwk, jwt
 from passlib.context import CryptContext
 import structlog
 
@@ -12,6 +17,17 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_HOURS = int(os.getenv("JWT_EXPIRATION_HOURS", "24"))
+TOKEN_CACHE_TTL = float(os.getenv("JWT_CACHE_TTL", "30"))
+TOKEN_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "10000"))
+
+# Verified payloads keyed by token digest; entries expire at min(exp, now + TTL)
+_token_cache: "OrderedDict[bytes, Tuple[float, Dict]]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+@lru_cache(maxsize=16)
+def _signing_key(secret: str, algorithm: str):
+    # jose otherwise tries json.loads on the secret and rebuilds the key on every call
+    return jwk.construct(secret, algorithm)
 
 def create_access_token(data: Dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
@@ -22,17 +38,42 @@ def create_access_token(data: Dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.utcnow() + timedelta(hours=ACCESS_TOKEN_EXPIRE_HOURS)
     
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _signing_key(SECRET_KEY, ALGORITHM), algorithm=ALGORITHM)
     
     return encoded_jwt
 
 def verify_token(token: str) -> Optional[Dict]:
+    cache_key = hashlib.sha256(token.encode()).digest()[:16]
+    now = time.time()
+    
+    if TOKEN_CACHE_TTL > 0:
+        with _token_cache_lock:
+            cached = _token_cache.get(cache_key)
+            if cached is not None:
+                if cached[0] > now:
+                    _token_cache.move_to_end(cache_key)
+                    return cached[1]
+                del _token_cache[cache_key]
+    
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
+        payload = jwt.decode(token, _signing_key(SECRET_KEY, ALGORITHM), algorithms=[ALGORITHM])
     except JWTError as e:
         logger.warning("token_verification_failed", error=str(e))
         return None
+    
+    # Only successful verifications are cached
+    if TOKEN_CACHE_TTL > 0:
+        expires_at = now + TOKEN_CACHE_TTL
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+        with _token_cache_lock:
+            _token_cache[cache_key] = (expires_at, payload)
+            _token_cache.move_to_end(cache_key)
+            while len(_token_cache) > TOKEN_CACHE_SIZE:
+                _token_cache.popitem(last=False)
+    
+    return payload
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -1,4 +1,5 @@
 import asyncio
+import heapq
 import time
 import uuid
 from typing import Dict, List, Optional
@@ -96,18 +97,13 @@ class CorrelationTracker:
         return self.traces.get(correlation_id)
     
     def get_recent_traces(self, limit: int = 50) -> List[Dict]:
-        sorted_traces = sorted(
-            self.traces.values(),
-            key=lambda t: t["started_at"],
-            reverse=True
-        )
-        return sorted_traces[:limit]
+        return heapq.nlargest(limit, self.traces.values(), key=lambda t: t["started_at"])
     
     def get_slow_traces(self, threshold_ms: int = 5000, limit: int = 20) -> List[Dict]:
-        slow_traces = [
+        slow_traces = (
             t for t in self.traces.values()
             if t.get("total_duration_ms", 0) > threshold_ms
-        ]
-        return sorted(slow_traces, key=lambda t: t["total_duration_ms"], reverse=True)[:limit]
+        )
+        return heapq.nlargest(limit, slow_traces, key=lambda t: t["total_duration_ms"])
 
 correlation_tracker = CorrelationTracker()
\ No newline at end of file
@@ -1,67 +1,71 @@
-import asyncio
+import threading
 import time
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 import structlog
-from collections import defaultdict, deque
 
 logger = structlog.get_logger()
 
 class RateLimiter:
     def __init__(self):
-        self.requests: Dict[str, deque] = defaultdict(deque)
         self.limits = {
             "default": {"requests": 100, "window": 60},
             "orchestrate": {"requests": 10, "window": 60},
             "admin": {"requests": 200, "window": 60}
         }
-        self.blocked_until: Dict[str, float] = {}
+        # (identifier, endpoint_type) -> (tokens, last_refill); refilled lazily on access
+        self.buckets: Dict[Tuple[str, str], Tuple[float, float]] = {}
+        self._lock = threading.Lock()
     
-    async def check_rate_limit(
+    def try_acquire(
         self,
         identifier: str,
         endpoint_type: str = "default"
     ) -> tuple[bool, Optional[str]]:
-        current_time = time.time()
-        
-        if identifier in self.blocked_until:
-            if current_time < self.blocked_until[identifier]:
-                remaining = int(self.blocked_until[identifier] - current_time)
-                return False, f"Rate limit exceeded. Try again in {remaining}s"
-            else:
-                del self.blocked_until[identifier]
-        
         limit_config = self.limits.get(endpoint_type, self.limits["default"])
-        max_requests = limit_config["requests"]
+        capacity = limit_config["requests"]
         window = limit_config["window"]
+        refill_rate = capacity / window
+        key = (identifier, endpoint_type)
         
-        request_queue = self.requests[identifier]
+        with self._lock:
+            now = time.monotonic()
+            tokens, last_refill = self.buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - last_refill) * refill_rate)
+            
+            if tokens >= 1:
+                self.buckets[key] = (tokens - 1, now)
+                return True, None
+            
+            self.buckets[key] = (tokens, now)
         
-        while request_queue and request_queue[0] < current_time - window:
-            request_queue.popleft()
-        
-        if len(request_queue) >= max_requests:
-            self.blocked_until[identifier] = current_time + window
-            logger.warning(
-                "rate_limit_exceeded",
-                identifier=identifier,
-                endpoint=endpoint_type,
-                requests=len(request_queue)
-            )
-            return False, f"Rate limit exceeded: {max_requests} requests per {window}s"
-        
-        request_queue.append(current_time)
-        return True, None
+        retry_after = int((1 - tokens) / refill_rate) + 1
+        logger.warning(
+            "rate_limit_exceeded",
+            identifier=identifier,
+            endpoint=endpoint_type
+        )
+        return False, f"Rate limit exceeded: {capacity} requests per {window}s. Try again in {retry_after}s"
+    
+    async def check_rate_limit(
+        self,
+        identifier: str,
+        endpoint_type: str = "default"
+    ) -> tuple[bool, Optional[str]]:
+        return self.try_acquire(identifier, endpoint_type)
     
-    def get_usage(self, identifier: str) -> Dict:
-        current_time = time.time()
-        request_queue = self.requests.get(identifier, deque())
+    def get_usage(self, identifier: str, endpoint_type: str = "default") -> Dict:
+        limit_config = self.limits.get(endpoint_type, self.limits["default"])
+        capacity = limit_config["requests"]
+        refill_rate = capacity / limit_config["window"]
         
-        recent_requests = sum(1 for t in request_queue if t > current_time - 60)
+        with self._lock:
+            tokens, last_refill = self.buckets.get((identifier, endpoint_type), (capacity, time.monotonic()))
+        tokens = min(capacity, tokens + (time.monotonic() - last_refill) * refill_rate)
         
         return {
-            "requests_last_minute": recent_requests,
-            "blocked": identifier in self.blocked_until,
-            "blocked_until": self.blocked_until.get(identifier)
+            "requests_available": int(tokens),
+            "capacity": capacity,
+            "blocked": tokens < 1
         }
 
 rate_limiter = RateLimiter()
\ No newline at end of file
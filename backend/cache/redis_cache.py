@@ -1,7 +1,7 @@
 import asyncio
-from typing import Any, Optional
-import json
+from typing import Any, Dict, List, Optional
 import os
+import orjson
 import structlog
 
 try:
@@ -37,7 +37,7 @@ class RedisCache:
             await self.client.ping()
             self._connected = True
             
-            logger.info("redis_init", event="redis_connected")
+            logger.info("redis_init", stage="redis_connected")
             
         except Exception as e:
             logger.warning("redis_init_failed", error=str(e))
@@ -50,7 +50,7 @@ class RedisCache:
         try:
             value = await self.client.get(key)
             if value:
-                return json.loads(value)
+                return orjson.loads(value)
             return None
         except Exception as e:
             logger.error("redis_get_failed", key=key, error=str(e))
@@ -64,11 +64,34 @@ class RedisCache:
             await self.client.setex(
                 key,
                 expire,
-                json.dumps(value)
+                orjson.dumps(value)
             )
         except Exception as e:
             logger.error("redis_set_failed", key=key, error=str(e))
     
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        if not keys or not self._connected or not self.client:
+            return [None] * len(keys)
+        
+        try:
+            values = await self.client.mget(keys)
+            return [orjson.loads(value) if value else None for value in values]
+        except Exception as e:
+            logger.error("redis_get_many_failed", count=len(keys), error=str(e))
+            return [None] * len(keys)
+    
+    async def set_many(self, items: Dict[str, Any], expire: int = 3600):
+        if not items or not self._connected or not self.client:
+            return
+        
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.setex(key, expire, orjson.dumps(value))
+                await pipe.execute()
+        except Exception as e:
+            logger.error("redis_set_many_failed", count=len(items), error=str(e))
+    
     async def delete(self, key: str):
         if not self._connected or not self.client:
             return
@@ -1,14 +1,15 @@
 import asyncio
-import hashlib
-import msgpack
 import os
 import time
+import zlib
 from functools import wraps
 from pathlib import Path
 from typing import Any, Callable, Optional, Dict, List
 import structlog
 from filelock import FileLock, Timeout
 
+from backend.utils.serialization import deserialize, generate_stable_key, serialize, serialize_many
+
 logger = structlog.get_logger()
 
 class RobustCacheManager:
@@ -45,14 +46,13 @@ class RobustCacheManager:
         )
     
     def _generate_key(self, func_name: str, args: tuple, kwargs: dict) -> str:
-        data = msgpack.packb(
-            {"func": func_name, "args": args, "kwargs": kwargs},
-            use_bin_type=True
-        )
-        return hashlib.blake2b(data, digest_size=16).hexdigest()
+        if kwargs:
+            return generate_stable_key(func_name, args, kwargs)
+        return generate_stable_key(func_name, *args)
     
     def _get_shard_path(self, key: str) -> Path:
-        shard_id = int(key[:2], 16) % self.shards
+        # Keys are not always hex digests (health checks, direct get/set callers)
+        shard_id = zlib.crc32(key.encode()) % self.shards
         shard_dir = self.cache_dir / f"shard_{shard_id}"
         shard_dir.mkdir(exist_ok=True)
         return shard_dir / f"{key}.cache"
@@ -108,7 +108,7 @@ class RobustCacheManager:
             lock.acquire(timeout=self.lock_timeout)
             try:
                 with open(cache_path, "rb") as f:
-                    data = msgpack.unpackb(f.read(), raw=False)
+                    data = deserialize(f.read())
                 
                 if data["expires_at"] and time.time() > data["expires_at"]:
                     cache_path.unlink(missing_ok=True)
@@ -131,6 +131,44 @@ class RobustCacheManager:
         expire: Optional[int] = None,
         tag: Optional[str] = None
     ):
+        now = time.time()
+        payload = serialize({
+            "value": value,
+            "expires_at": now + expire if expire else None,
+            "tag": tag,
+            "created_at": now,
+        })
+        
+        self._write(key, payload)
+    
+    async def set_many(
+        self,
+        items: Dict[str, Any],
+        expire: Optional[int] = None,
+        tag: Optional[str] = None
+    ):
+        """
+        Store several entries with the same expiry and tag.
+        
+        Every payload is encoded up front with one encoder, so each key's lock
+        is only held for the file write.
+        """
+        now = time.time()
+        keys = list(items)
+        payloads = serialize_many(
+            {
+                "value": items[key],
+                "expires_at": now + expire if expire else None,
+                "tag": tag,
+                "created_at": now,
+            }
+            for key in keys
+        )
+        
+        for key, payload in zip(keys, payloads):
+            self._write(key, payload)
+    
+    def _write(self, key: str, payload: bytes):
         cache_path = self._get_shard_path(key)
         lock_path = self._get_lock_path(key)
         
@@ -139,15 +177,8 @@ class RobustCacheManager:
         try:
             lock.acquire(timeout=self.lock_timeout)
             try:
-                data = {
-                    "value": value,
-                    "expires_at": time.time() + expire if expire else None,
-                    "tag": tag,
-                    "created_at": time.time(),
-                }
-                
                 with open(cache_path, "wb") as f:
-                    f.write(msgpack.packb(data, use_bin_type=True))
+                    f.write(payload)
             finally:
                 lock.release()
         except Timeout:
@@ -160,7 +191,7 @@ class RobustCacheManager:
             for cache_file in shard_dir.glob("*.cache"):
                 try:
                     with open(cache_file, "rb") as f:
-                        data = msgpack.unpackb(f.read(), raw=False)
+                        data = deserialize(f.read())
                     
                     if data.get("tag") == tag:
                         cache_file.unlink(missing_ok=True)
@@ -199,12 +230,24 @@ class RobustCacheManager:
     def memoize(
         self,
         expire: Optional[int] = None,
-        tag: Optional[str] = None
+        tag: Optional[str] = None,
+        key_func: Optional[Callable[..., tuple]] = None
     ) -> Callable:
+        """
+        Cache an async function's result on disk.
+        
+        By default the key covers every positional and keyword argument, which
+        must be msgpack-serializable. Pass key_func to derive the key from the
+        call instead; it receives the same arguments and returns a tuple of
+        serializable parts, e.g. to skip self or normalize inputs.
+        """
         def decorator(func: Callable) -> Callable:
             @wraps(func)
             async def wrapper(*args, **kwargs):
-                key = self._generate_key(func.__name__, args, kwargs)
+                if key_func is not None:
+                    key = self._generate_key(func.__name__, key_func(*args, **kwargs), {})
+                else:
+                    key = self._generate_key(func.__name__, args, kwargs)
                 
                 cached = await self.get(key)
                 if cached is not None:
@@ -29,7 +29,7 @@ class AuditLogger:
             await self._create_tables()
             
             self._connected = True
-            logger.info("audit_logger_init", event="database_connected")
+            logger.info("audit_logger_init", stage="database_connected")
             
         except Exception as e:
             logger.warning("audit_logger_init_failed", error=str(e))
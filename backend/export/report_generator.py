@@ -1,20 +1,78 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+from collections import OrderedDict
 import structlog
 from datetime import datetime
+import asyncio
+import threading
+import csv
+import os
 import io
 import base64
+import orjson
+from functools import lru_cache
+from markupsafe import escape
+
+try:
+    from reportlab.lib.pagesizes import letter, A4
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER, TA_LEFT
+    REPORTLAB_AVAILABLE = True
+except ImportError:
+    REPORTLAB_AVAILABLE = False
+
+try:
+    from docx import Document
+    from docx.shared import Inches, Pt, RGBColor
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    DOCX_AVAILABLE = True
+except ImportError:
+    DOCX_AVAILABLE = False
+
+try:
+    import xlsxwriter
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+    PILLOW_AVAILABLE = True
+except ImportError:
+    PILLOW_AVAILABLE = False
 
 logger = structlog.get_logger()
 
+@lru_cache(maxsize=1)
+def _load_fonts() -> Tuple[Any, Any, Any]:
+    """
+    Load the image report fonts once per process.
+    """
+    try:
+        return (
+            ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 24),
+            ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 16),
+            ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 12),
+        )
+    except OSError:
+        default_font = ImageFont.load_default()
+        return default_font, default_font, default_font
+
 class ReportGenerator:
     """
     Generates reports in multiple formats from orchestration results.
     """
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 256, max_concurrent_reports: int = 4):
         self.supported_formats = [
             "pdf", "docx", "xlsx", "csv", "png", "jpeg", "json", "html", "markdown"
         ]
+        self.cache_size = cache_size
+        self._render_semaphore = asyncio.Semaphore(max_concurrent_reports)
+        self._cache: "OrderedDict[Tuple[str, str, Any], bytes]" = OrderedDict()
+        self._cache_lock = threading.Lock()
     
     def generate_report(
         self,
@@ -30,298 +88,331 @@ class ReportGenerator:
         if format not in self.supported_formats:
             raise ValueError(f"Unsupported format: {format}")
         
+        request_id = data.get('request_id')
+        cache_key = (request_id, format, data.get('updated_at'))
+        
+        if request_id is not None:
+            with self._cache_lock:
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    self._cache.move_to_end(cache_key)
+                    logger.debug("report_cache_hit", request_id=request_id, format=format)
+                    return cached
+        
         logger.info("generating_report", format=format, template=template)
         
+        # Stamped once on the shared data so every format of a report agrees
+        data.setdefault('_generated', datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC'))
+        
         if format == "pdf":
-            return self._generate_pdf(data)
+            content = self._generate_pdf(data)
         elif format == "docx":
-            return self._generate_docx(data)
+            content = self._generate_docx(data)
         elif format == "xlsx":
-            return self._generate_excel(data)
+            content = self._generate_excel(data)
         elif format == "csv":
-            return self._generate_csv(data)
+            content = self._generate_csv(data)
         elif format == "png":
-            return self._generate_image(data, "png")
+            content = self._generate_image(data, "png")
         elif format == "jpeg":
-            return self._generate_image(data, "jpeg")
+            content = self._generate_image(data, "jpeg")
         elif format == "json":
-            return self._generate_json(data)
+            content = self._generate_json(data)
         elif format == "html":
-            return self._generate_html(data)
+            content = self._generate_html(data)
         elif format == "markdown":
-            return self._generate_markdown(data)
+            content = self._generate_markdown(data)
+        
+        if request_id is not None:
+            with self._cache_lock:
+                self._cache[cache_key] = content
+                self._cache.move_to_end(cache_key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        
+        return content
+    
+    async def agenerate_report(
+        self,
+        data: Dict[str, Any],
+        format: str,
+        template: Optional[str] = None
+    ) -> bytes:
+        """
+        Generate a report in a worker thread so rendering never blocks the event loop.
+        
+        Concurrent renders are capped per worker so a burst of PDF requests
+        cannot exhaust the default thread pool.
+        """
+        async with self._render_semaphore:
+            return await asyncio.to_thread(self.generate_report, data, format, template)
+    
+    async def generate_many(
+        self,
+        data: Dict[str, Any],
+        formats: List[str],
+        template: Optional[str] = None
+    ) -> Dict[str, bytes]:
+        """
+        Generate several formats of the same report concurrently.
+        
+        Each format renders in a worker thread; reportlab, xlsxwriter and Pillow
+        release the GIL in their C code, so threads overlap without having to
+        pickle data across processes.
+        """
+        results = await asyncio.gather(*[
+            self.agenerate_report(data, fmt, template)
+            for fmt in formats
+        ])
+        return dict(zip(formats, results))
+    
+    def invalidate(self, request_id: str) -> int:
+        """
+        Drop every cached rendering of a request, in all formats.
+        """
+        with self._cache_lock:
+            stale = [key for key in self._cache if key[0] == request_id]
+            for key in stale:
+                del self._cache[key]
+        
+        if stale:
+            logger.info("report_cache_invalidated", request_id=request_id, removed=len(stale))
+        return len(stale)
+    
+    def clear_cache(self):
+        with self._cache_lock:
+            self._cache.clear()
+        logger.info("report_cache_cleared")
     
     def _generate_pdf(self, data: Dict) -> bytes:
         """
         Generate PDF report using reportlab.
         """
-        try:
-            from reportlab.lib.pagesizes import letter, A4
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib.units import inch
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-            from reportlab.lib import colors
-            from reportlab.lib.enums import TA_CENTER, TA_LEFT
-            
-            buffer = io.BytesIO()
-            doc = SimpleDocTemplate(buffer, pagesize=letter)
-            story = []
-            styles = getSampleStyleSheet()
-            
-            # Custom styles
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                textColor=colors.HexColor('#667eea'),
-                spaceAfter=30,
-                alignment=TA_CENTER
-            )
-            
-            heading_style = ParagraphStyle(
-                'CustomHeading',
-                parent=styles['Heading2'],
-                fontSize=16,
-                textColor=colors.HexColor('#333333'),
-                spaceAfter=12
-            )
-            
-            # Title
-            story.append(Paragraph("Network Consultant AI Report", title_style))
-            story.append(Spacer(1, 0.2*inch))
-            
-            # Metadata
-            story.append(Paragraph("Report Details", heading_style))
-            metadata_data = [
-                ['Generated:', datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')],
-                ['Request ID:', data.get('request_id', 'N/A')],
-                ['Priority:', data.get('priority', 'N/A')],
-                ['Confidence:', f"{data.get('confidence', 0) * 100:.1f}%"]
-            ]
-            
-            metadata_table = Table(metadata_data, colWidths=[2*inch, 4*inch])
-            metadata_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f0f0f0')),
-                ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.grey)
-            ]))
-            story.append(metadata_table)
-            story.append(Spacer(1, 0.3*inch))
-            
-            # Issue
-            story.append(Paragraph("Client Issue", heading_style))
-            story.append(Paragraph(data.get('client_issue', 'N/A'), styles['Normal']))
-            story.append(Spacer(1, 0.2*inch))
-            
-            # Consensus
-            story.append(Paragraph("Consensus Analysis", heading_style))
-            story.append(Paragraph(data.get('consensus', 'N/A'), styles['Normal']))
-            story.append(Spacer(1, 0.2*inch))
-            
-            # Recommendations
-            if 'recommendations' in data and data['recommendations']:
-                story.append(Paragraph("Recommendations", heading_style))
-                for i, rec in enumerate(data['recommendations'], 1):
-                    story.append(Paragraph(f"{i}. {rec}", styles['Normal']))
-                    story.append(Spacer(1, 0.1*inch))
-            
-            # Agent Analysis
-            if 'agents' in data:
-                story.append(PageBreak())
-                story.append(Paragraph("Agent Analysis", heading_style))
-                
-                for agent_name, agent_data in data['agents'].items():
-                    story.append(Paragraph(f"<b>{agent_name}</b>", styles['Heading3']))
-                    story.append(Paragraph(agent_data.get('analysis', 'N/A'), styles['Normal']))
-                    story.append(Spacer(1, 0.15*inch))
-            
-            doc.build(story)
-            buffer.seek(0)
-            return buffer.getvalue()
-            
-        except ImportError:
+        if not REPORTLAB_AVAILABLE:
             logger.error("reportlab_not_installed")
             raise ImportError("Install reportlab: pip install reportlab")
+        
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=letter)
+        story = []
+        styles = getSampleStyleSheet()
+        
+        # Custom styles
+        title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            textColor=colors.HexColor('#667eea'),
+            spaceAfter=30,
+            alignment=TA_CENTER
+        )
+        
+        heading_style = ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=16,
+            textColor=colors.HexColor('#333333'),
+            spaceAfter=12
+        )
+        
+        # Title
+        story.append(Paragraph("Network Consultant AI Report", title_style))
+        story.append(Spacer(1, 0.2*inch))
+        
+        # Metadata
+        story.append(Paragraph("Report Details", heading_style))
+        metadata_data = [
+            ['Generated:', data['_generated']],
+            ['Request ID:', data.get('request_id', 'N/A')],
+            ['Priority:', data.get('priority', 'N/A')],
+            ['Confidence:', f"{data.get('confidence', 0) * 100:.1f}%"]
+        ]
+        
+        metadata_table = Table(metadata_data, colWidths=[2*inch, 4*inch])
+        metadata_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f0f0f0')),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey)
+        ]))
+        story.append(metadata_table)
+        story.append(Spacer(1, 0.3*inch))
+        
+        # Issue
+        story.append(Paragraph("Client Issue", heading_style))
+        story.append(Paragraph(data.get('client_issue', 'N/A'), styles['Normal']))
+        story.append(Spacer(1, 0.2*inch))
+        
+        # Consensus
+        story.append(Paragraph("Consensus Analysis", heading_style))
+        story.append(Paragraph(data.get('consensus', 'N/A'), styles['Normal']))
+        story.append(Spacer(1, 0.2*inch))
+        
+        # Recommendations
+        if 'recommendations' in data and data['recommendations']:
+            story.append(Paragraph("Recommendations", heading_style))
+            for i, rec in enumerate(data['recommendations'], 1):
+                story.append(Paragraph(f"{i}. {rec}", styles['Normal']))
+                story.append(Spacer(1, 0.1*inch))
+        
+        # Agent Analysis
+        if 'agents' in data:
+            story.append(PageBreak())
+            story.append(Paragraph("Agent Analysis", heading_style))
+            
+            for agent_name, agent_data in data['agents'].items():
+                story.append(Paragraph(f"<b>{agent_name}</b>", styles['Heading3']))
+                story.append(Paragraph(agent_data.get('analysis', 'N/A'), styles['Normal']))
+                story.append(Spacer(1, 0.15*inch))
+        
+        doc.build(story)
+        buffer.seek(0)
+        return buffer.getvalue()
     
     def _generate_docx(self, data: Dict) -> bytes:
         """
         Generate DOCX report using python-docx.
         """
-        try:
-            from docx import Document
-            from docx.shared import Inches, Pt, RGBColor
-            from docx.enum.text import WD_ALIGN_PARAGRAPH
-            
-            doc = Document()
-            
-            # Title
-            title = doc.add_heading('Network Consultant AI Report', 0)
-            title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            title.runs[0].font.color.rgb = RGBColor(102, 126, 234)
-            
-            # Metadata
-            doc.add_heading('Report Details', level=1)
-            table = doc.add_table(rows=4, cols=2)
-            table.style = 'Light Grid Accent 1'
-            
-            cells = [
-                ['Generated:', datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')],
-                ['Request ID:', data.get('request_id', 'N/A')],
-                ['Priority:', data.get('priority', 'N/A')],
-                ['Confidence:', f"{data.get('confidence', 0) * 100:.1f}%"]
-            ]
-            
-            for i, (key, value) in enumerate(cells):
-                table.rows[i].cells[0].text = key
-                table.rows[i].cells[1].text = value
-            
-            # Issue
-            doc.add_heading('Client Issue', level=1)
-            doc.add_paragraph(data.get('client_issue', 'N/A'))
-            
-            # Consensus
-            doc.add_heading('Consensus Analysis', level=1)
-            doc.add_paragraph(data.get('consensus', 'N/A'))
-            
-            # Recommendations
-            if 'recommendations' in data and data['recommendations']:
-                doc.add_heading('Recommendations', level=1)
-                for rec in data['recommendations']:
-                    doc.add_paragraph(rec, style='List Bullet')
-            
-            # Agent Analysis
-            if 'agents' in data:
-                doc.add_page_break()
-                doc.add_heading('Agent Analysis', level=1)
-                
-                for agent_name, agent_data in data['agents'].items():
-                    doc.add_heading(agent_name, level=2)
-                    doc.add_paragraph(agent_data.get('analysis', 'N/A'))
-            
-            # Red Flag Warning
-            if data.get('red_flagged'):
-                doc.add_paragraph()
-                warning = doc.add_paragraph('⚠️ RED FLAG: This issue requires immediate attention!')
-                warning.runs[0].font.color.rgb = RGBColor(220, 53, 69)
-                warning.runs[0].font.bold = True
-            
-            buffer = io.BytesIO()
-            doc.save(buffer)
-            buffer.seek(0)
-            return buffer.getvalue()
-            
-        except ImportError:
+        if not DOCX_AVAILABLE:
             logger.error("python_docx_not_installed")
             raise ImportError("Install python-docx: pip install python-docx")
+        
+        doc = Document()
+        
+        # Title
+        title = doc.add_heading('Network Consultant AI Report', 0)
+        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        title.runs[0].font.color.rgb = RGBColor(102, 126, 234)
+        
+        # Metadata
+        doc.add_heading('Report Details', level=1)
+        table = doc.add_table(rows=4, cols=2)
+        table.style = 'Light Grid Accent 1'
+        
+        cells = [
+            ['Generated:', data['_generated']],
+            ['Request ID:', data.get('request_id', 'N/A')],
+            ['Priority:', data.get('priority', 'N/A')],
+            ['Confidence:', f"{data.get('confidence', 0) * 100:.1f}%"]
+        ]
+        
+        for i, (key, value) in enumerate(cells):
+            table.rows[i].cells[0].text = key
+            table.rows[i].cells[1].text = value
+        
+        # Issue
+        doc.add_heading('Client Issue', level=1)
+        doc.add_paragraph(data.get('client_issue', 'N/A'))
+        
+        # Consensus
+        doc.add_heading('Consensus Analysis', level=1)
+        doc.add_paragraph(data.get('consensus', 'N/A'))
+        
+        # Recommendations
+        if 'recommendations' in data and data['recommendations']:
+            doc.add_heading('Recommendations', level=1)
+            for rec in data['recommendations']:
+                doc.add_paragraph(rec, style='List Bullet')
+        
+        # Agent Analysis
+        if 'agents' in data:
+            doc.add_page_break()
+            doc.add_heading('Agent Analysis', level=1)
+            
+            for agent_name, agent_data in data['agents'].items():
+                doc.add_heading(agent_name, level=2)
+                doc.add_paragraph(agent_data.get('analysis', 'N/A'))
+        
+        # Red Flag Warning
+        if data.get('red_flagged'):
+            doc.add_paragraph()
+            warning = doc.add_paragraph('⚠️ RED FLAG: This issue requires immediate attention!')
+            warning.runs[0].font.color.rgb = RGBColor(220, 53, 69)
+            warning.runs[0].font.bold = True
+        
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        buffer.seek(0)
+        return buffer.getvalue()
     
     def _generate_excel(self, data: Dict) -> bytes:
         """
-        Generate Excel report using openpyxl.
+        Generate Excel report using xlsxwriter.
+        
+        constant_memory mode streams each row to the zip writer as soon as the
+        next row starts, so rows must be written top to bottom per sheet.
         """
-        try:
-            from openpyxl import Workbook
-            from openpyxl.styles import Font, PatternFill, Alignment
-            
-            wb = Workbook()
-            
-            # Summary Sheet
-            ws_summary = wb.active
-            ws_summary.title = "Summary"
-            
-            # Headers
-            ws_summary['A1'] = "Network Consultant AI Report"
-            ws_summary['A1'].font = Font(size=16, bold=True, color="667eea")
-            ws_summary.merge_cells('A1:B1')
-            
-            # Metadata
-            row = 3
-            ws_summary[f'A{row}'] = "Generated:"
-            ws_summary[f'B{row}'] = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')
-            row += 1
-            
-            ws_summary[f'A{row}'] = "Request ID:"
-            ws_summary[f'B{row}'] = data.get('request_id', 'N/A')
-            row += 1
-            
-            ws_summary[f'A{row}'] = "Priority:"
-            ws_summary[f'B{row}'] = data.get('priority', 'N/A')
-            row += 1
-            
-            ws_summary[f'A{row}'] = "Confidence:"
-            ws_summary[f'B{row}'] = f"{data.get('confidence', 0) * 100:.1f}%"
-            row += 2
-            
-            # Issue
-            ws_summary[f'A{row}'] = "Client Issue:"
-            ws_summary[f'A{row}'].font = Font(bold=True)
-            row += 1
-            ws_summary[f'A{row}'] = data.get('client_issue', 'N/A')
-            ws_summary.merge_cells(f'A{row}:B{row}')
-            row += 2
-            
-            # Consensus
-            ws_summary[f'A{row}'] = "Consensus:"
-            ws_summary[f'A{row}'].font = Font(bold=True)
+        if not XLSXWRITER_AVAILABLE:
+            logger.error("xlsxwriter_not_installed")
+            raise ImportError("Install XlsxWriter: pip install XlsxWriter")
+        
+        buffer = io.BytesIO()
+        wb = xlsxwriter.Workbook(buffer, {'constant_memory': True, 'in_memory': True})
+        
+        title_format = wb.add_format({'bold': True, 'font_color': '#667eea', 'font_size': 16})
+        heading_format = wb.add_format({'bold': True, 'font_size': 14})
+        bold = wb.add_format({'bold': True})
+        
+        # Summary Sheet
+        ws_summary = wb.add_worksheet("Summary")
+        ws_summary.set_column(0, 0, 20)
+        ws_summary.set_column(1, 1, 80)
+        
+        # Headers
+        ws_summary.merge_range(0, 0, 0, 1, "Network Consultant AI Report", title_format)
+        
+        # Metadata
+        row = 2
+        for label, value in (
+            ("Generated:", data['_generated']),
+            ("Request ID:", data.get('request_id', 'N/A')),
+            ("Priority:", data.get('priority', 'N/A')),
+            ("Confidence:", f"{data.get('confidence', 0) * 100:.1f}%"),
+        ):
+            ws_summary.write_row(row, 0, [label, value])
             row += 1
-            ws_summary[f'A{row}'] = data.get('consensus', 'N/A')
-            ws_summary.merge_cells(f'A{row}:B{row}')
-            
-            # Recommendations Sheet
-            if 'recommendations' in data and data['recommendations']:
-                ws_rec = wb.create_sheet("Recommendations")
-                ws_rec['A1'] = "Recommendations"
-                ws_rec['A1'].font = Font(size=14, bold=True)
-                
-                for i, rec in enumerate(data['recommendations'], 2):
-                    ws_rec[f'A{i}'] = rec
-            
-            # Agent Analysis Sheet
-            if 'agents' in data:
-                ws_agents = wb.create_sheet("Agent Analysis")
-                ws_agents['A1'] = "Agent"
-                ws_agents['B1'] = "Analysis"
-                ws_agents['A1'].font = Font(bold=True)
-                ws_agents['B1'].font = Font(bold=True)
-                
-                row = 2
-                for agent_name, agent_data in data['agents'].items():
-                    ws_agents[f'A{row}'] = agent_name
-                    ws_agents[f'B{row}'] = agent_data.get('analysis', 'N/A')
-                    row += 1
-            
-            # Auto-size columns
-            for ws in wb.worksheets:
-                for column in ws.columns:
-                    max_length = 0
-                    column = [cell for cell in column]
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(cell.value)
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 100)
-                    ws.column_dimensions[column[0].column_letter].width = adjusted_width
-            
-            buffer = io.BytesIO()
-            wb.save(buffer)
-            buffer.seek(0)
-            return buffer.getvalue()
+        row += 1
+        
+        # Issue
+        ws_summary.write(row, 0, "Client Issue:", bold)
+        row += 1
+        ws_summary.merge_range(row, 0, row, 1, data.get('client_issue', 'N/A'))
+        row += 2
+        
+        # Consensus
+        ws_summary.write(row, 0, "Consensus:", bold)
+        row += 1
+        ws_summary.merge_range(row, 0, row, 1, data.get('consensus', 'N/A'))
+        
+        # Recommendations Sheet
+        if 'recommendations' in data and data['recommendations']:
+            ws_rec = wb.add_worksheet("Recommendations")
+            ws_rec.set_column(0, 0, 100)
+            ws_rec.write(0, 0, "Recommendations", heading_format)
+            
+            for i, rec in enumerate(data['recommendations'], 1):
+                ws_rec.write(i, 0, rec)
+        
+        # Agent Analysis Sheet
+        if 'agents' in data:
+            ws_agents = wb.add_worksheet("Agent Analysis")
+            ws_agents.set_column(0, 0, 25)
+            ws_agents.set_column(1, 1, 100)
+            ws_agents.write_row(0, 0, ["Agent", "Analysis"], bold)
             
-        except ImportError:
-            logger.error("openpyxl_not_installed")
-            raise ImportError("Install openpyxl: pip install openpyxl")
+            for row, (agent_name, agent_data) in enumerate(data['agents'].items(), 1):
+                ws_agents.write_row(row, 0, [agent_name, agent_data.get('analysis', 'N/A')])
+        
+        wb.close()
+        return buffer.getvalue()
     
     def _generate_csv(self, data: Dict) -> bytes:
         """
         Generate CSV export.
         """
-        import csv
-        
         buffer = io.StringIO()
         writer = csv.writer(buffer)
         
@@ -329,7 +420,7 @@ class ReportGenerator:
         writer.writerow(['Field', 'Value'])
         
         # Metadata
-        writer.writerow(['Generated', datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')])
+        writer.writerow(['Generated', data['_generated']])
         writer.writerow(['Request ID', data.get('request_id', 'N/A')])
         writer.writerow(['Priority', data.get('priority', 'N/A')])
         writer.writerow(['Confidence', f"{data.get('confidence', 0) * 100:.1f}%"])
@@ -364,90 +455,103 @@ class ReportGenerator:
         """
         Generate image report (PNG/JPEG) using Pillow.
         """
-        try:
-            from PIL import Image, ImageDraw, ImageFont
-            
-            # Create image
-            width, height = 800, 1200
-            bg_color = (255, 255, 255)
-            img = Image.new('RGB', (width, height), bg_color)
-            draw = ImageDraw.Draw(img)
-            
-            # Try to use a nice font, fallback to default
-            try:
-                title_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 24)
-                heading_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 16)
-                normal_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 12)
-            except:
-                title_font = ImageFont.load_default()
-                heading_font = ImageFont.load_default()
-                normal_font = ImageFont.load_default()
-            
-            y_position = 30
-            padding = 20
-            
-            # Title
-            draw.text((padding, y_position), "Network Consultant AI Report", 
-                     fill=(102, 126, 234), font=title_font)
-            y_position += 50
-            
-            # Metadata
-            draw.text((padding, y_position), "Report Details", fill=(51, 51, 51), font=heading_font)
-            y_position += 30
-            
-            metadata = [
-                f"Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}",
-                f"Request ID: {data.get('request_id', 'N/A')}",
-                f"Priority: {data.get('priority', 'N/A')}",
-                f"Confidence: {data.get('confidence', 0) * 100:.1f}%"
-            ]
-            
-            for line in metadata:
-                draw.text((padding, y_position), line, fill=(0, 0, 0), font=normal_font)
-                y_position += 20
-            
-            y_position += 20
-            
-            # Issue
-            draw.text((padding, y_position), "Client Issue", fill=(51, 51, 51), font=heading_font)
-            y_position += 30
-            
-            issue_text = data.get('client_issue', 'N/A')
-            words = issue_text.split()
-            line = ""
-            for word in words:
-                test_line = line + word + " "
-                if len(test_line) * 7 < width - (padding * 2):
-                    line = test_line
-                else:
-                    draw.text((padding, y_position), line, fill=(0, 0, 0), font=normal_font)
-                    y_position += 20
-                    line = word + " "
-            if line:
-                draw.text((padding, y_position), line, fill=(0, 0, 0), font=normal_font)
-                y_position += 20
-            
-            y_position += 20
-            
-            # Red Flag Warning
-            if data.get('red_flagged'):
-                draw.text((padding, y_position), "⚠️ RED FLAG: Immediate attention required!", 
-                         fill=(220, 53, 69), font=heading_font)
-            
-            buffer = io.BytesIO()
-            img.save(buffer, format=format.upper())
-            buffer.seek(0)
-            return buffer.getvalue()
-            
-        except ImportError:
+        if not PILLOW_AVAILABLE:
             logger.error("pillow_not_installed")
             raise ImportError("Install Pillow: pip install Pillow")
+        
+        # Create image
+        width, height = 800, 1200
+        bg_color = (255, 255, 255)
+        img = Image.new('RGB', (width, height), bg_color)
+        draw = ImageDraw.Draw(img)
+        
+        title_font, heading_font, normal_font = _load_fonts()
+        
+        y_position = 30
+        padding = 20
+        
+        # Title
+        draw.text((padding, y_position), "Network Consultant AI Report", 
+                 fill=(102, 126, 234), font=title_font)
+        y_position += 50
+        
+        # Metadata
+        draw.text((padding, y_position), "Report Details", fill=(51, 51, 51), font=heading_font)
+        y_position += 30
+        
+        metadata = [
+            f"Generated: {data['_generated']}",
+            f"Request ID: {data.get('request_id', 'N/A')}",
+            f"Priority: {data.get('priority', 'N/A')}",
+            f"Confidence: {data.get('confidence', 0) * 100:.1f}%"
+        ]
+        
+        for line in metadata:
+            draw.text((padding, y_position), line, fill=(0, 0, 0), font=normal_font)
+            y_position += 20
+        
+        y_position += 20
+        
+        # Issue
+        draw.text((padding, y_position), "Client Issue", fill=(51, 51, 51), font=heading_font)
+        y_position += 30
+        
+        # Wrap on measured glyph widths, then draw the block in one call
+        max_line_width = width - (padding * 2)
+        space_width = draw.textlength(" ", font=normal_font)
+        lines = []
+        line_words = []
+        line_width = 0.0
+        for word in data.get('client_issue', 'N/A').split():
+            word_width = draw.textlength(word, font=normal_font)
+            if line_words and line_width + space_width + word_width > max_line_width:
+                lines.append(" ".join(line_words))
+                line_words = [word]
+                line_width = word_width
+            else:
+                line_width += word_width + (space_width if line_words else 0)
+                line_words.append(word)
+        if line_words:
+            lines.append(" ".join(line_words))
+        
+        if lines:
+            issue_block = "\n".join(lines)
+            draw.multiline_text((padding, y_position), issue_block,
+                                fill=(0, 0, 0), font=normal_font, spacing=4)
+            bbox = draw.multiline_textbbox((padding, y_position), issue_block,
+                                           font=normal_font, spacing=4)
+            y_position = bbox[3] + 8
+        
+        y_position += 20
+        
+        # Red Flag Warning
+        if data.get('red_flagged'):
+            draw.text((padding, y_position), "⚠️ RED FLAG: Immediate attention required!", 
+                     fill=(220, 53, 69), font=heading_font)
+        
+        buffer = io.BytesIO()
+        img.save(buffer, format=format.upper())
+        buffer.seek(0)
+        return buffer.getvalue()
     
     def _generate_json(self, data: Dict) -> bytes:
-        import json
-        return json.dumps(data, indent=2).encode('utf-8')
+        payload = {k: v for k, v in data.items() if k != '_generated'}
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2)
     
     def _generate_html(self, data: Dict) -> bytes:
+        request_id = escape(data.get('request_id', 'N/A'))
+        priority = escape(data.get('priority', 'N/A'))
+        client_issue = escape(data.get('client_issue', 'N/A'))
+        consensus = escape(data.get('consensus', 'N/A'))
+        recommendations = "".join(
+            f'<div class="recommendation">{escape(rec)}</div>'
+            for rec in data.get('recommendations', [])
+        )
+        agents = "".join(
+            f'<h3>{escape(name)}</h3><p>{escape(agent.get("analysis", "N/A"))}</p>'
+            for name, agent in data.get('agents', {}).items()
+        )
+        
         html = f"""
 <!DOCTYPE html>
 <html>
@@ -466,35 +570,41 @@ class ReportGenerator:
     <h1>Network Consultant AI Report</h1>
     
     <div class="metadata">
-        <p><strong>Generated:</strong> {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}</p>
-        <p><strong>Request ID:</strong> {data.get('request_id', 'N/A')}</p>
-        <p><strong>Priority:</strong> {data.get('priority', 'N/A')}</p>
+        <p><strong>Generated:</strong> {data['_generated']}</p>
+        <p><strong>Request ID:</strong> {request_id}</p>
+        <p><strong>Priority:</strong> {priority}</p>
         <p><strong>Confidence:</strong> {data.get('confidence', 0) * 100:.1f}%</p>
     </div>
     
     {'<div class="warning">⚠️ RED FLAG: This issue requires immediate attention!</div>' if data.get('red_flagged') else ''}
     
     <h2>Client Issue</h2>
-    <p>{data.get('client_issue', 'N/A')}</p>
+    <p>{client_issue}</p>
     
     <h2>Consensus Analysis</h2>
-    <p>{data.get('consensus', 'N/A')}</p>
+    <p>{consensus}</p>
     
     <h2>Recommendations</h2>
-    {''.join(f'<div class="recommendation">{rec}</div>' for rec in data.get('recommendations', []))}
+    {recommendations}
     
     <h2>Agent Analysis</h2>
-    {''.join(f'<h3>{name}</h3><p>{agent.get("analysis", "N/A")}</p>' for name, agent in data.get('agents', {}).items())}
+    {agents}
 </body>
 </html>
         """
         return html.encode('utf-8')
     
     def _generate_markdown(self, data: Dict) -> bytes:
+        recommendations = "".join(f"- {rec}\n" for rec in data.get('recommendations', []))
+        agents = "".join(
+            f"### {name}\n{agent.get('analysis', 'N/A')}\n\n"
+            for name, agent in data.get('agents', {}).items()
+        )
+        
         md = f"""# Network Consultant AI Report
 
 ## Report Details
-- **Generated:** {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}
+- **Generated:** {data['_generated']}
 - **Request ID:** {data.get('request_id', 'N/A')}
 - **Priority:** {data.get('priority', 'N/A')}
 - **Confidence:** {data.get('confidence', 0) * 100:.1f}%
@@ -508,11 +618,14 @@ class ReportGenerator:
 {data.get('consensus', 'N/A')}
 
 ## Recommendations
-{''.join(f'- {rec}\n' for rec in data.get('recommendations', []))}
+{recommendations}
 
 ## Agent Analysis
-{''.join(f'### {name}\n{agent.get("analysis", "N/A")}\n\n' for name, agent in data.get('agents', {}).items())}
+{agents}
         """
         return md.encode('utf-8')
 
-report_generator = ReportGenerator()
\ No newline at end of file
+report_generator = ReportGenerator(
+    cache_size=int(os.getenv("REPORT_CACHE_SIZE", "256")),
+    max_concurrent_reports=int(os.getenv("MAX_CONCURRENT_REPORTS", "4")),
+)
\ No newline at end of file
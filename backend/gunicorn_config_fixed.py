@@ -2,19 +2,22 @@ import multiprocessing
 import os
 
 bind = "0.0.0.0:3000"
-workers = int(os.getenv("WORKERS", multiprocessing.cpu_count()))
-worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.getenv("WORKERS", max(2, multiprocessing.cpu_count())))
+# uvicorn[standard] selects uvloop and httptools automatically when installed
+worker_class = os.getenv("WORKER_CLASS", "uvicorn.workers.UvicornWorker")
+worker_tmp_dir = os.getenv("WORKER_TMP_DIR", "/dev/shm")
 keepalive = 120
 timeout = 300
 graceful_timeout = 30
-max_requests = 1000
-max_requests_jitter = 50
+# Recycling re-imports the report libraries cold, so keep it infrequent
+max_requests = int(os.getenv("MAX_REQUESTS", "10000"))
+max_requests_jitter = int(os.getenv("MAX_REQUESTS_JITTER", "500"))
 
 accesslog = "-"
 errorlog = "-"
 loglevel = os.getenv("LOG_LEVEL", "info").lower()
 
-preload_app = False
+preload_app = True
 
 def on_starting(server):
     server.log.info("Gunicorn master starting")
@@ -26,4 +29,9 @@ def worker_int(worker):
     worker.log.info(f"Worker {worker.pid} interrupted")
 
 def worker_abort(worker):
-    worker.log.error(f"Worker {worker.pid} aborted")
\ No newline at end of file
+    worker.log.error(f"Worker {worker.pid} aborted")
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
\ No newline at end of file
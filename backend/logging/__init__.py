@@ -1,4 +1,6 @@
+import logging
 import os
+import orjson
 import structlog
 
 def configure_logging():
@@ -14,14 +16,18 @@ def configure_logging():
     
     if environment == "production":
         processors.append(structlog.processors.format_exc_info)
-        processors.append(structlog.processors.JSONRenderer())
+        # orjson emits bytes, which BytesLogger writes straight to stdout's buffer
+        processors.append(structlog.processors.JSONRenderer(serializer=orjson.dumps))
+        logger_factory = structlog.BytesLoggerFactory()
     else:
         processors.append(structlog.dev.ConsoleRenderer())
+        logger_factory = structlog.PrintLoggerFactory()
     
     structlog.configure(
         processors=processors,
-        wrapper_class=structlog.make_filtering_bound_logger(getattr(structlog, log_level, structlog.INFO)),
+        # Drops below-threshold events before any processor runs
+        wrapper_class=structlog.make_filtering_bound_logger(getattr(logging, log_level, logging.INFO)),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
\ No newline at end of file
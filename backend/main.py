@@ -1,12 +1,12 @@
 from contextlib import asynccontextmanager
-from typing import Optional
+from typing import Literal, Optional
+import os
+import secrets
 import time
 
 from fastapi import FastAPI, HTTPException, Depends, status, Request
 from fastapi.responses import ORJSONResponse, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.staticfiles import StaticFiles
-from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 import structlog
 
@@ -18,8 +18,9 @@ from backend.metrics.prometheus import metrics, CONTENT_TYPE_LATEST
 from backend.api.admin_routes import router as admin_router
 from backend.api.export_routes import router as export_router
 from backend.api.versioning import router_v2
+from backend.api.cors import AllowListCORSMiddleware
+from backend.api.static_files import CachedStaticFiles
 from backend.autonomous.health_monitor import health_monitor
-from backend.autonomous.self_healing import self_healing_actions
 from backend.autonomous.alert_manager import alert_manager
 from backend.autonomous.rate_limiter import rate_limiter
 from backend.autonomous.circuit_breaker import circuit_breaker_manager
@@ -31,12 +32,25 @@ from backend.tenancy.multi_tenant import multi_tenant_manager
 from backend.audit.comprehensive_audit import comprehensive_audit
 from backend.database.audit_logger import audit_logger
 from backend.cache.redis_cache import redis_cache
+from backend.notifications.email_service import email_service
 
-configure_logging()
 logger = structlog.get_logger()
 
 security = HTTPBearer()
 orchestrator = ProductionOrchestrator()
+# Resolved once; registered here if the autonomous defaults ever stop providing it
+openai_breaker = (
+    circuit_breaker_manager.get("openai_api")
+    or circuit_breaker_manager.register("openai_api", failure_threshold=3, timeout=120)
+)
+
+CORS_ALLOWED_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv("FRONTEND_ORIGIN", "").split(",")
+    if origin.strip()
+]
+# Probes and scrapers never come from a browser
+CORS_EXEMPT_PREFIXES = ("/health", "/metrics")
 
 async def verify_auth_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     token = credentials.credentials
@@ -51,6 +65,9 @@ async def verify_auth_token(credentials: HTTPAuthorizationCredentials = Depends(
     return payload
 
 async def setup_autonomous_monitoring():
+    # Healing actions are only wired up here, so load them with the monitors
+    from backend.autonomous.self_healing import self_healing_actions
+    
     health_monitor.register_component(
         "cache",
         check_func=robust_cache.health_check,
@@ -85,17 +102,23 @@ async def setup_autonomous_monitoring():
 
 @asynccontextmanager
 async def robust_lifespan(app: FastAPI):
-    logger.info("startup", event="application_starting", version="2.3.0")
+    # Configured per worker at startup rather than at import in the gunicorn master
+    configure_logging()
+    logger.info("startup", stage="application_starting", version="2.3.0")
     await robust_cache.cleanup_stale_locks()
     await orchestrator.initialize()
+    await comprehensive_audit.start()
+    await email_service.start()
     await setup_autonomous_monitoring()
     yield
-    logger.info("shutdown", event="application_stopping")
+    logger.info("shutdown", stage="application_stopping")
     await health_monitor.stop()
     await performance_optimizer.stop()
     await anomaly_detector.stop()
     await backup_manager.stop()
     await task_scheduler.stop()
+    await comprehensive_audit.stop()
+    await email_service.stop()
     await orchestrator.shutdown()
 
 app = FastAPI(
@@ -107,11 +130,9 @@ app = FastAPI(
 )
 
 app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    AllowListCORSMiddleware,
+    allow_origins=CORS_ALLOWED_ORIGINS,
+    exempt_prefixes=CORS_EXEMPT_PREFIXES,
 )
 
 app.include_router(admin_router)
@@ -125,7 +146,7 @@ class ClientContext(BaseModel):
 
 class OrchestrateRequest(BaseModel):
     client_issue: str = Field(..., min_length=10, max_length=2000)
-    priority: str = Field(default="medium", pattern="^(low|medium|high|critical)$")
+    priority: Literal["low", "medium", "high", "critical"] = "medium"
     client_context: Optional[ClientContext] = None
     tags: list[str] = Field(default_factory=list)
 
@@ -148,42 +169,46 @@ class HealthResponse(BaseModel):
 
 start_time = time.time()
 
-@app.middleware("http")
-async def comprehensive_audit_middleware(request: Request, call_next):
-    start = time.time()
-    
-    response = await call_next(request)
-    
-    duration_ms = int((time.time() - start) * 1000)
-    
-    # Log API call to audit trail
-    user_id = "anonymous"
-    tenant_id = "default"
-    
-    await comprehensive_audit.log_api_call(
-        user_id=user_id,
-        tenant_id=tenant_id,
-        endpoint=request.url.path,
-        method=request.method,
-        status_code=response.status_code,
-        duration_ms=duration_ms,
-        ip_address=request.client.host
-    )
-    
-    return response
+# Probe timestamps only change once per second, so format them at most that often
+_health_timestamp = (0, "")
+
+def _utc_timestamp() -> str:
+    global _health_timestamp
+    now = int(time.time())
+    if now != _health_timestamp[0]:
+        _health_timestamp = (now, time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now)))
+    return _health_timestamp[1]
+
+HEALTH_CACHE_TTL = float(os.getenv("HEALTH_CACHE_TTL", "0.5"))
+_health_snapshot = (float("-inf"), "degraded", {})
+
+# Probes and scrapes bypass rate limiting and the audit trail
+PROBE_PATHS = frozenset({
+    "/health",
+    "/health/live",
+    "/health/ready",
+    "/health/startup",
+    "/metrics"
+})
+
+# Rate-limit buckets resolved from the routes instead of substring scans
+RATE_LIMIT_ROUTES = {
+    "/api/v1/orchestrate": "orchestrate"
+}
+ADMIN_PATH_PREFIX = admin_router.prefix + "/"
 
 @app.middleware("http")
-async def rate_limit_middleware(request: Request, call_next):
-    client_ip = request.client.host
+async def request_middleware(request: Request, call_next):
     path = request.url.path
+    if path in PROBE_PATHS:
+        return await call_next(request)
     
-    endpoint_type = "default"
-    if "/orchestrate" in path:
-        endpoint_type = "orchestrate"
-    elif "/admin" in path:
-        endpoint_type = "admin"
+    client_ip = request.client.host
+    endpoint_type = RATE_LIMIT_ROUTES.get(path)
+    if endpoint_type is None:
+        endpoint_type = "admin" if path.startswith(ADMIN_PATH_PREFIX) else "default"
     
-    allowed, message = await rate_limiter.check_rate_limit(client_ip, endpoint_type)
+    allowed, message = rate_limiter.try_acquire(client_ip, endpoint_type)
     
     if not allowed:
         return ORJSONResponse(
@@ -191,87 +216,104 @@ async def rate_limit_middleware(request: Request, call_next):
             content={"detail": message}
         )
     
+    start = time.perf_counter_ns()
+    
     response = await call_next(request)
+    
+    duration_ms = (time.perf_counter_ns() - start) // 1_000_000
+    
+    # Queue the API call for the audit consumer; never blocks the response
+    comprehensive_audit.enqueue_api_call(
+        user_id="anonymous",
+        tenant_id="default",
+        endpoint=path,
+        method=request.method,
+        status_code=response.status_code,
+        duration_ms=duration_ms,
+        ip_address=client_ip
+    )
+    
     return response
 
-@app.post("/api/v1/orchestrate", response_model=OrchestrateResponse)
+# Log previews only; the full issue text goes to the audit database
+ISSUE_PREVIEW_CHARS = 100
+
+@app.post(
+    "/api/v1/orchestrate",
+    response_model=None,
+    responses={200: {"model": OrchestrateResponse}}
+)
 async def orchestrate_issue(
     request: OrchestrateRequest,
     auth_payload: dict = Depends(verify_auth_token)
 ):
-    start = time.time()
-    request_id = f"req_{int(start * 1000)}"
+    start = time.perf_counter_ns()
+    request_id = f"req_{secrets.token_hex(8)}"
     
     user_id = auth_payload.get("sub")
     tenant_id = auth_payload.get("tenant_id", "default")
     
-    # Check tenant quota
-    allowed, quota_message = multi_tenant_manager.check_quota(tenant_id)
+    # Check the tenant quota and reserve this request atomically
+    allowed, quota_message = multi_tenant_manager.check_and_increment(tenant_id)
     if not allowed:
         raise HTTPException(status_code=429, detail=quota_message)
     
-    logger.info(
+    log = logger.bind(request_id=request_id, user_id=user_id, tenant_id=tenant_id)
+    issue = request.client_issue
+    log.info(
         "orchestration_request",
-        request_id=request_id,
-        issue=request.client_issue[:100],
-        priority=request.priority,
-        user_id=user_id,
-        tenant_id=tenant_id
+        issue=issue if len(issue) <= ISSUE_PREVIEW_CHARS else issue[:ISSUE_PREVIEW_CHARS],
+        priority=request.priority
     )
     
+    ctx = request.client_context
+    context = {
+        "environment": ctx.environment,
+        "users_affected": ctx.users_affected,
+        "location": ctx.location
+    } if ctx else {}
+    
     try:
-        breaker = circuit_breaker_manager.get("openai_api")
-        if breaker:
-            result = await breaker.call(
-                orchestrator.orchestrate,
-                issue=request.client_issue,
-                priority=request.priority,
-                context=request.client_context.dict() if request.client_context else {},
-                tags=request.tags,
-                user_id=user_id
-            )
-        else:
-            result = await orchestrator.orchestrate(
-                issue=request.client_issue,
-                priority=request.priority,
-                context=request.client_context.dict() if request.client_context else {},
-                tags=request.tags,
-                user_id=user_id
-            )
-        
-        processing_time = int((time.time() - start) * 1000)
+        result = await openai_breaker.call(
+            orchestrator.orchestrate,
+            issue=issue,
+            priority=request.priority,
+            context=context,
+            tags=request.tags,
+            user_id=user_id
+        )
         
-        # Increment tenant usage
-        multi_tenant_manager.increment_usage(tenant_id)
+        processing_time = (time.perf_counter_ns() - start) // 1_000_000
         
         performance_optimizer.record_metric("orchestration_response_time", processing_time)
         anomaly_detector.record_value("orchestration_response_time", processing_time)
         
-        response = OrchestrateResponse(
-            status="success",
-            consensus=result["consensus"],
-            confidence=result["confidence"],
-            agents=result["agents"],
-            recommendations=result["recommendations"],
-            red_flagged=result["red_flagged"],
-            processing_time_ms=processing_time,
-            request_id=request_id
-        )
+        # Plain dict: the orchestrator output is already typed, skip re-validation
+        response = {
+            "status": "success",
+            "consensus": result["consensus"],
+            "confidence": result["confidence"],
+            "agents": result["agents"],
+            "recommendations": result["recommendations"],
+            "red_flagged": result["red_flagged"],
+            "processing_time_ms": processing_time,
+            "request_id": request_id
+        }
         
-        logger.info(
+        log.info(
             "orchestration_complete",
-            request_id=request_id,
             processing_time_ms=processing_time,
             consensus=result["consensus"],
             confidence=result["confidence"]
         )
         
-        return response
+        return ORJSONResponse(response)
         
     except Exception as e:
-        logger.error(
+        # Failed orchestrations do not count against the quota
+        multi_tenant_manager.release_usage(tenant_id)
+        log.error(
             "orchestration_failed",
-            request_id=request_id,
             error=str(e),
             exc_info=True
         )
@@ -280,26 +322,38 @@ async def orchestrate_issue(
             detail=f"Orchestration failed: {str(e)}"
         )
 
-@app.get("/health", response_model=HealthResponse)
+@app.get(
+    "/health",
+    response_model=None,
+    responses={200: {"model": HealthResponse}}
+)
 async def health_check():
-    components = {
-        "cache": "healthy" if await robust_cache.health_check() else "unhealthy",
-        "orchestrator": "healthy" if orchestrator.is_healthy() else "unhealthy",
-        "lock_system": "healthy",
-        "autonomous_monitor": "healthy" if health_monitor.running else "stopped",
-        "performance_optimizer": "healthy" if performance_optimizer.running else "stopped",
-        "anomaly_detector": "healthy" if anomaly_detector.running else "stopped",
-        "backup_manager": "healthy" if backup_manager.running else "stopped",
-        "task_scheduler": "healthy" if task_scheduler.running else "stopped"
-    }
+    global _health_snapshot
+    now = time.monotonic()
     
-    return HealthResponse(
-        status="healthy" if all(v == "healthy" for v in components.values()) else "degraded",
-        timestamp=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-        components=components,
-        uptime_seconds=int(time.time() - start_time),
-        version="2.3.0"
-    )
+    # Load balancers can probe far more often than kubelet; reuse a fresh snapshot
+    if now - _health_snapshot[0] >= HEALTH_CACHE_TTL:
+        components = {
+            "cache": "healthy" if await robust_cache.health_check() else "unhealthy",
+            "orchestrator": "healthy" if orchestrator.is_healthy() else "unhealthy",
+            "lock_system": "healthy",
+            "autonomous_monitor": "healthy" if health_monitor.running else "stopped",
+            "performance_optimizer": "healthy" if performance_optimizer.running else "stopped",
+            "anomaly_detector": "healthy" if anomaly_detector.running else "stopped",
+            "backup_manager": "healthy" if backup_manager.running else "stopped",
+            "task_scheduler": "healthy" if task_scheduler.running else "stopped"
+        }
+        overall = "healthy" if all(v == "healthy" for v in components.values()) else "degraded"
+        _health_snapshot = (time.monotonic(), overall, components)
+    
+    # Built as a plain dict and encoded by orjson directly, like /api/v1/orchestrate
+    return ORJSONResponse({
+        "status": _health_snapshot[1],
+        "timestamp": _utc_timestamp(),
+        "components": _health_snapshot[2],
+        "uptime_seconds": int(time.time() - start_time),
+        "version": "2.3.0"
+    })
 
 @app.get("/health/live")
 async def liveness_probe():
@@ -318,7 +372,13 @@ async def startup_probe():
     return {"status": "started"}
 
 @app.get("/metrics")
-async def metrics_endpoint():
+async def metrics_endpoint(request: Request):
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(
+            content=metrics.generate_metrics(gzipped=True),
+            media_type=CONTENT_TYPE_LATEST,
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+        )
     return Response(
         content=metrics.generate_metrics(),
         media_type=CONTENT_TYPE_LATEST
@@ -364,4 +424,17 @@ async def get_anomalies(limit: int = 50):
 async def get_performance():
     return performance_optimizer.analyze_performance()
 
-app.mount("/", StaticFiles(directory="static", html=True), name="static")
\ No newline at end of file
+app.mount("/", CachedStaticFiles(directory="static", html=True), name="static")
+
+if __name__ == "__main__":
+    import uvicorn
+    
+    # Direct runs mirror the gunicorn worker setup: uvloop + httptools from uvicorn[standard]
+    uvicorn.run(
+        "backend.main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "3000")),
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WORKERS", max(2, os.cpu_count() or 1)))
+    )
\ No newline at end of file
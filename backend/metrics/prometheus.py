@@ -1,4 +1,9 @@
 from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import CollectorRegistry, multiprocess
+from typing import Iterable
+import gzip
+import os
+import time
 import structlog
 
 logger = structlog.get_logger()
@@ -54,38 +59,125 @@ class PrometheusMetrics:
             ['priority']
         )
         
+        self.audit_drops = Counter(
+            'audit_drops_total',
+            'Audit events dropped because the audit queue was full',
+            ['event_type']
+        )
+        
         self.active_orchestrations = Gauge(
             'active_orchestrations',
             'Current active orchestrations'
         )
         
+        self._counters = {
+            'orchestration_requests_total': self.orchestration_requests,
+            'agent_executions_total': self.agent_executions,
+            'agent_errors_total': self.agent_errors,
+            'cache_hits_total': self.cache_hits,
+            'cache_misses_total': self.cache_misses,
+            'red_flags_total': self.red_flags,
+            'orchestration_errors_total': self.orchestration_errors,
+            'audit_drops_total': self.audit_drops,
+        }
+        self._histograms = {
+            'orchestration_duration_seconds': self.orchestration_duration,
+        }
+        self._gauges = {
+            'active_orchestrations': self.active_orchestrations,
+        }
+        
+        # Label children resolved once per (metric, label values) and reused
+        self._children = {}
+        for priority in ('low', 'medium', 'high', 'critical'):
+            for name in ('orchestration_requests_total', 'orchestration_errors_total', 'red_flags_total'):
+                self._child(name, self._counters[name], {'priority': priority})
+            self._child('orchestration_duration_seconds', self.orchestration_duration, {'priority': priority})
+        
+        # Scrapes within this window reuse the last exposition payload
+        self.exposition_ttl = float(os.getenv("METRICS_CACHE_TTL", "1.0"))
+        self._exposition_at = float("-inf")
+        self._exposition = b""
+        self._exposition_gzip = None
+        
         logger.info("prometheus_metrics_initialized")
     
+    def _child(self, metric_name: str, metric, labels: dict):
+        key = (metric_name, *labels.values())
+        child = self._children.get(key)
+        if child is None:
+            child = metric.labels(**labels)
+            self._children[key] = child
+        return child
+    
     def increment_counter(self, metric_name: str, labels: dict):
         try:
-            counter = getattr(self, metric_name.replace('_total', ''), None)
+            counter = self._counters.get(metric_name)
             if counter:
-                counter.labels(**labels).inc()
+                self._child(metric_name, counter, labels).inc()
         except Exception as e:
             logger.error("metric_increment_failed", metric=metric_name, error=str(e))
     
     def observe_histogram(self, metric_name: str, value: float, labels: dict):
         try:
-            histogram = getattr(self, metric_name.replace('_seconds', ''), None)
+            histogram = self._histograms.get(metric_name)
             if histogram:
-                histogram.labels(**labels).observe(value)
+                self._child(metric_name, histogram, labels).observe(value)
         except Exception as e:
             logger.error("metric_observe_failed", metric=metric_name, error=str(e))
     
+    def record_orchestration(
+        self,
+        priority: str,
+        duration_seconds: float,
+        red_flagged: bool,
+        executed_roles: Iterable[str],
+        failed_roles: Iterable[str]
+    ):
+        """
+        Record all per-orchestration observations in one block at the end of
+        the request instead of interleaving them with agent execution.
+        """
+        try:
+            self._child('orchestration_duration_seconds', self.orchestration_duration,
+                        {'priority': priority}).observe(duration_seconds)
+            for role in executed_roles:
+                self._child('agent_executions_total', self.agent_executions, {'role': role}).inc()
+            for role in failed_roles:
+                self._child('agent_errors_total', self.agent_errors, {'role': role}).inc()
+            if red_flagged:
+                self._child('red_flags_total', self.red_flags, {'priority': priority}).inc()
+        except Exception as e:
+            logger.error("metric_record_failed", metric="orchestration", error=str(e))
+    
     def set_gauge(self, metric_name: str, value: float):
         try:
-            gauge = getattr(self, metric_name, None)
+            gauge = self._gauges.get(metric_name)
             if gauge:
                 gauge.set(value)
         except Exception as e:
             logger.error("metric_set_failed", metric=metric_name, error=str(e))
     
-    def generate_metrics(self):
+    def _collect(self) -> bytes:
+        # Under gunicorn each forked worker writes its samples to
+        # PROMETHEUS_MULTIPROC_DIR; aggregate them at scrape time.
+        if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+            return generate_latest(registry)
         return generate_latest()
+    
+    def generate_metrics(self, gzipped: bool = False) -> bytes:
+        now = time.monotonic()
+        if now - self._exposition_at >= self.exposition_ttl:
+            self._exposition = self._collect()
+            self._exposition_gzip = None
+            self._exposition_at = now
+        
+        if not gzipped:
+            return self._exposition
+        if self._exposition_gzip is None:
+            self._exposition_gzip = gzip.compress(self._exposition, compresslevel=1)
+        return self._exposition_gzip
 
 metrics = PrometheusMetrics()
\ No newline at end of file
@@ -1,5 +1,7 @@
+from functools import cached_property
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field
+from typing_extensions import TypedDict
 from enum import Enum
 
 class AgentRole(str, Enum):
@@ -9,13 +11,19 @@ class AgentRole(str, Enum):
     COMPLIANCE_CHECKER = "compliance_checker"
     DOCUMENTATION_AGENT = "documentation_agent"
 
+class AgentMetadata(TypedDict, total=False):
+    role: str
+    execution_time_ms: int
+    priority: str
+    error: str
+
 class AgentAnalysis(BaseModel):
     verdict: str = Field(..., description="Agent's analysis verdict")
     confidence: float = Field(..., ge=0.0, le=1.0, description="Confidence score")
     reasoning: Optional[str] = Field(None, description="Detailed reasoning")
     red_flags: List[str] = Field(default_factory=list, description="Identified red flags")
     recommendations: List[str] = Field(default_factory=list, description="Action recommendations")
-    metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
+    metadata: AgentMetadata = Field(default_factory=dict, description="Additional metadata")
 
 class ConsensusResult(BaseModel):
     consensus: str = Field(..., description="Final consensus verdict")
@@ -33,4 +41,12 @@ class AgentConfig(BaseModel):
     allow_delegation: bool = False
     verbose: bool = False
     max_iterations: int = 5
-    max_execution_time: Optional[int] = None
\ No newline at end of file
+    max_execution_time: Optional[int] = None
+    
+    @cached_property
+    def role_value(self) -> str:
+        return self.role.value
+    
+    @cached_property
+    def role_display(self) -> str:
+        return self.role.value.replace('_', ' ').title()
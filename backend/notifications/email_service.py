@@ -1,15 +1,69 @@
 import asyncio
-import smtplib
+import base64
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
-from email import encoders
+from string import Template
 from typing import List, Optional, Dict
 import structlog
 import os
+from markupsafe import escape
+
+try:
+    import aiosmtplib
+    AIOSMTPLIB_AVAILABLE = True
+except ImportError:
+    AIOSMTPLIB_AVAILABLE = False
+    aiosmtplib = None
 
 logger = structlog.get_logger()
 
+REPORT_EMAIL_TEXT = Template("""
+Hello,
+
+Please find attached the network analysis report for request ${request_id}.
+
+Summary:
+- Priority: ${priority}
+- Confidence: ${confidence}%
+- Red Flagged: ${red_flagged}
+
+Issue: ${client_issue}
+
+Best regards,
+Network Consultant AI
+""")
+
+REPORT_EMAIL_HTML = Template("""
+<html>
+<body style="font-family: Arial, sans-serif;">
+    <h2 style="color: #667eea;">Network Analysis Report</h2>
+    <p>Please find attached the analysis report for request <strong>${request_id}</strong>.</p>
+    
+    <div style="background: #f5f7fa; padding: 15px; border-radius: 8px; margin: 20px 0;">
+        <h3>Summary</h3>
+        <ul>
+            <li><strong>Priority:</strong> ${priority}</li>
+            <li><strong>Confidence:</strong> ${confidence}%</li>
+            <li><strong>Red Flagged:</strong> ${red_flagged}</li>
+        </ul>
+    </div>
+    
+    <p><strong>Issue:</strong> ${client_issue}</p>
+    
+    <p style="margin-top: 30px; color: #666;">Best regards,<br>Network Consultant AI</p>
+</body>
+</html>
+""")
+
+class EmailJob:
+    def __init__(self, msg: MIMEMultipart, to: List[str], subject: str, attachment_count: int = 0):
+        self.msg = msg
+        self.to = to
+        self.subject = subject
+        self.attachment_count = attachment_count
+
 class EmailService:
     """
     Send email notifications with attachments.
@@ -22,11 +76,172 @@ class EmailService:
         self.smtp_password = os.getenv("SMTP_PASSWORD", "")
         self.from_email = os.getenv("FROM_EMAIL", self.smtp_user)
         self.enabled = bool(self.smtp_user and self.smtp_password)
+        # Reused connections idle longer than this are NOOP-probed before sending
+        self.idle_probe_seconds = float(os.getenv("SMTP_IDLE_PROBE_SECONDS", "30"))
+        self.batch_size = int(os.getenv("EMAIL_BATCH_SIZE", "100"))
+        self.batch_interval = float(os.getenv("EMAIL_BATCH_INTERVAL", "1.0"))
+        self.outbox_size = int(os.getenv("EMAIL_OUTBOX_SIZE", "1000"))
+        self._smtp = None
+        self._smtp_last_used = 0.0
+        self._smtp_lock = asyncio.Lock()
+        self._outbox: Optional[asyncio.Queue] = None
+        self.running = False
+        self.flush_task = None
         
         if not self.enabled:
             logger.warning("email_service_disabled", reason="missing_credentials")
+        elif not AIOSMTPLIB_AVAILABLE:
+            self.enabled = False
+            logger.warning("email_service_disabled", reason="aiosmtplib_not_installed")
     
-    async def send_email(
+    async def start(self):
+        if self.running or not self.enabled:
+            return
+        
+        self._outbox = asyncio.Queue(maxsize=self.outbox_size)
+        self.running = True
+        self.flush_task = asyncio.create_task(self._flush_loop())
+        logger.info("email_outbox_started", batch_size=self.batch_size)
+    
+    async def stop(self):
+        self.running = False
+        if self.flush_task:
+            # The loop sends the batch it was holding before it exits
+            self.flush_task.cancel()
+            try:
+                await self.flush_task
+            except asyncio.CancelledError:
+                pass
+            self.flush_task = None
+        
+        pending = []
+        while self._outbox is not None and not self._outbox.empty():
+            pending.append(self._outbox.get_nowait())
+        if pending:
+            await self._send_many(pending)
+        
+        await self.close()
+        logger.info("email_outbox_stopped", flushed=len(pending))
+    
+    async def _get_conn(self):
+        """
+        Return the shared SMTP connection, reconnecting if it was dropped.
+        Callers must hold self._smtp_lock.
+        """
+        if self._smtp is not None and self._smtp.is_connected:
+            if time.monotonic() - self._smtp_last_used < self.idle_probe_seconds:
+                return self._smtp
+            try:
+                await self._smtp.noop()
+                return self._smtp
+            except aiosmtplib.SMTPException:
+                self._smtp.close()
+                self._smtp = None
+        
+        smtp = aiosmtplib.SMTP(
+            hostname=self.smtp_host,
+            port=self.smtp_port,
+            start_tls=self.smtp_port != 465,
+            use_tls=self.smtp_port == 465,
+            timeout=30
+        )
+        try:
+            await smtp.connect()
+            await smtp.login(self.smtp_user, self.smtp_password)
+        except BaseException:
+            # Don't leave a connected (possibly STARTTLS'd) transport behind
+            smtp.close()
+            raise
+        self._smtp = smtp
+        logger.info("smtp_connected", host=self.smtp_host, port=self.smtp_port)
+        return smtp
+    
+    async def _send_many(self, jobs: List[EmailJob]) -> int:
+        """
+        Send jobs over one SMTP connection. Rejected recipients are logged and
+        skipped; a large batch is abandoned once more than a third has failed.
+        Returns the number of messages accepted by the server.
+        """
+        sent = 0
+        failures = 0
+        
+        async with self._smtp_lock:
+            for job in jobs:
+                try:
+                    for attempt in range(2):
+                        conn = await self._get_conn()
+                        try:
+                            await conn.send_message(job.msg)
+                            break
+                        except aiosmtplib.SMTPServerDisconnected:
+                            # Server closed the idle connection; reconnect once
+                            self._smtp = None
+                            if attempt:
+                                raise
+                    
+                    self._smtp_last_used = time.monotonic()
+                    sent += 1
+                    logger.info(
+                        "email_sent",
+                        to=job.to,
+                        subject=job.subject,
+                        attachments=job.attachment_count
+                    )
+                except aiosmtplib.SMTPRecipientsRefused as e:
+                    failures += 1
+                    logger.warning("email_recipients_refused", to=job.to, error=str(e))
+                except Exception as e:
+                    failures += 1
+                    logger.error("email_send_failed", to=job.to, error=str(e), exc_info=True)
+                
+                if len(jobs) >= 30 and failures > len(jobs) // 3:
+                    logger.error("email_batch_aborted", sent=sent, failures=failures, total=len(jobs))
+                    break
+        
+        return sent
+    
+    async def _flush_loop(self):
+        loop = asyncio.get_running_loop()
+        batch = []
+        sending = None
+        
+        while self.running:
+            try:
+                batch = [await self._outbox.get()]
+                deadline = loop.time() + self.batch_interval
+                
+                while len(batch) < self.batch_size:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._outbox.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+                
+                # Shielded so a cancel cannot cut a batch off halfway through
+                sending = asyncio.ensure_future(self._send_many(batch))
+                batch = []
+                await asyncio.shield(sending)
+            except asyncio.CancelledError:
+                if sending is not None and not sending.done():
+                    await sending
+                if batch:
+                    await self._send_many(batch)
+                break
+            except Exception as e:
+                logger.error("email_flush_error", error=str(e))
+    
+    async def close(self):
+        async with self._smtp_lock:
+            if self._smtp is not None and self._smtp.is_connected:
+                try:
+                    await self._smtp.quit()
+                except aiosmtplib.SMTPException as e:
+                    logger.warning("smtp_quit_failed", error=str(e))
+            self._smtp = None
+    
+    def _build_job(
         self,
         to: List[str],
         subject: str,
@@ -35,66 +250,91 @@ class EmailService:
         attachments: Optional[List[Dict]] = None,
         cc: Optional[List[str]] = None,
         bcc: Optional[List[str]] = None
+    ) -> EmailJob:
+        msg = MIMEMultipart('alternative')
+        msg['From'] = self.from_email
+        msg['To'] = ', '.join(to)
+        msg['Subject'] = subject
+        
+        if cc:
+            msg['Cc'] = ', '.join(cc)
+        if bcc:
+            msg['Bcc'] = ', '.join(bcc)
+        
+        # Add text body
+        msg.attach(MIMEText(body, 'plain'))
+        
+        # Add HTML body if provided
+        if html_body:
+            msg.attach(MIMEText(html_body, 'html'))
+        
+        # Add attachments
+        if attachments:
+            for attachment in attachments:
+                part = MIMEBase('application', 'octet-stream')
+                # Encode straight from the report bytes; set_payload(bytes) plus
+                # encode_base64 keeps several full-size copies alive at once
+                part.set_payload(base64.encodebytes(attachment['content']).decode('ascii'))
+                part['Content-Transfer-Encoding'] = 'base64'
+                part.add_header(
+                    'Content-Disposition',
+                    f'attachment; filename= {attachment["filename"]}'
+                )
+                msg.attach(part)
+        
+        return EmailJob(msg, to, subject, len(attachments) if attachments else 0)
+    
+    async def send_email(
+        self,
+        to: List[str],
+        subject: str,
+        body: str,
+        html_body: Optional[str] = None,
+        attachments: Optional[List[Dict]] = None,
+        cc: Optional[List[str]] = None,
+        bcc: Optional[List[str]] = None,
+        urgent: bool = False
     ) -> bool:
         """
         Send email with optional HTML and attachments.
         
         attachments format: [{"filename": "report.pdf", "content": bytes}]
+        
+        Messages are queued for the batching outbox when it is running and
+        True means the message was accepted for delivery. Urgent messages,
+        or any message while the outbox is stopped, are sent immediately.
         """
         if not self.enabled:
             logger.warning("email_not_sent", reason="service_disabled")
             return False
         
         try:
-            msg = MIMEMultipart('alternative')
-            msg['From'] = self.from_email
-            msg['To'] = ', '.join(to)
-            msg['Subject'] = subject
-            
-            if cc:
-                msg['Cc'] = ', '.join(cc)
-            if bcc:
-                msg['Bcc'] = ', '.join(bcc)
-            
-            # Add text body
-            msg.attach(MIMEText(body, 'plain'))
-            
-            # Add HTML body if provided
-            if html_body:
-                msg.attach(MIMEText(html_body, 'html'))
-            
-            # Add attachments
-            if attachments:
-                for attachment in attachments:
-                    part = MIMEBase('application', 'octet-stream')
-                    part.set_payload(attachment['content'])
-                    encoders.encode_base64(part)
-                    part.add_header(
-                        'Content-Disposition',
-                        f'attachment; filename= {attachment["filename"]}'
-                    )
-                    msg.attach(part)
-            
-            # Send email
-            all_recipients = to + (cc or []) + (bcc or [])
-            
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
-                server.send_message(msg)
-            
-            logger.info(
-                "email_sent",
-                to=to,
-                subject=subject,
-                attachments=len(attachments) if attachments else 0
-            )
-            
-            return True
-            
+            job = self._build_job(to, subject, body, html_body, attachments, cc, bcc)
         except Exception as e:
             logger.error("email_send_failed", error=str(e), exc_info=True)
             return False
+        
+        if self.running and not urgent:
+            try:
+                self._outbox.put_nowait(job)
+                return True
+            except asyncio.QueueFull:
+                logger.warning("email_outbox_full", to=to, subject=subject)
+        
+        return await self._send_many([job]) == 1
+    
+    async def send_batch(self, messages: List[Dict]) -> int:
+        """
+        Send several emails over a single SMTP connection.
+        
+        Each message takes the same keyword arguments as send_email.
+        Returns the number of messages accepted by the server.
+        """
+        if not self.enabled:
+            logger.warning("email_not_sent", reason="service_disabled", count=len(messages))
+            return 0
+        
+        return await self._send_many([self._build_job(**message) for message in messages])
     
     async def send_report_email(
         self,
@@ -110,48 +350,29 @@ class EmailService:
         
         try:
             # Generate report
-            report_content = report_generator.generate_report(report_data, format)
+            report_content = await report_generator.agenerate_report(report_data, format)
             
             # Create email
             subject = f"Network Analysis Report - {request_id}"
             
-            body = f"""
-Hello,
-
-Please find attached the network analysis report for request {request_id}.
-
-Summary:
-- Priority: {report_data.get('priority', 'N/A')}
-- Confidence: {report_data.get('confidence', 0) * 100:.1f}%
-- Red Flagged: {'Yes' if report_data.get('red_flagged') else 'No'}
-
-Issue: {report_data.get('client_issue', 'N/A')}
-
-Best regards,
-Network Consultant AI
-            """
+            confidence = f"{report_data.get('confidence', 0) * 100:.1f}"
+            red_flagged = bool(report_data.get('red_flagged'))
             
-            html_body = f"""
-<html>
-<body style="font-family: Arial, sans-serif;">
-    <h2 style="color: #667eea;">Network Analysis Report</h2>
-    <p>Please find attached the analysis report for request <strong>{request_id}</strong>.</p>
-    
-    <div style="background: #f5f7fa; padding: 15px; border-radius: 8px; margin: 20px 0;">
-        <h3>Summary</h3>
-        <ul>
-            <li><strong>Priority:</strong> {report_data.get('priority', 'N/A')}</li>
-            <li><strong>Confidence:</strong> {report_data.get('confidence', 0) * 100:.1f}%</li>
-            <li><strong>Red Flagged:</strong> {'Yes ⚠️' if report_data.get('red_flagged') else 'No'}</li>
-        </ul>
-    </div>
-    
-    <p><strong>Issue:</strong> {report_data.get('client_issue', 'N/A')}</p>
-    
-    <p style="margin-top: 30px; color: #666;">Best regards,<br>Network Consultant AI</p>
-</body>
-</html>
-            """
+            body = REPORT_EMAIL_TEXT.substitute(
+                request_id=request_id,
+                priority=report_data.get('priority', 'N/A'),
+                confidence=confidence,
+                red_flagged='Yes' if red_flagged else 'No',
+                client_issue=report_data.get('client_issue', 'N/A')
+            )
+            
+            html_body = REPORT_EMAIL_HTML.substitute(
+                request_id=escape(request_id),
+                priority=escape(report_data.get('priority', 'N/A')),
+                confidence=confidence,
+                red_flagged='Yes ⚠️' if red_flagged else 'No',
+                client_issue=escape(report_data.get('client_issue', 'N/A'))
+            )
             
             attachments = [{
                 "filename": f"network_report_{request_id}.{format}",
@@ -1,9 +1,11 @@
 import asyncio
 from typing import Dict, List, Any, Optional
+import hashlib
+import os
+import re
 import time
+import orjson
 import structlog
-from crewai import Agent, Task, Crew, Process
-from langchain_openai import ChatOpenAI
 
 from backend.models.agent_models import (
     AgentRole,
@@ -12,23 +14,79 @@ from backend.models.agent_models import (
     AgentConfig
 )
 from backend.cache.robust_cache import robust_cache
+from backend.orchestration.llm_gateway import LLMGateway
 from backend.database.audit_logger import audit_logger
 from backend.cache.redis_cache import redis_cache
 from backend.metrics.prometheus import metrics
 
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+    re2 = None
+
 logger = structlog.get_logger()
 
+RECOMMENDATION_LINE = re.compile(r"^.*(?:recommend|suggest|should|verify|check).*$", re.IGNORECASE | re.MULTILINE)
+# Keyword scans usually find nothing and read the whole text; RE2's DFA does
+# that far faster than re. Line extraction above stays on re, which is quicker
+# at producing match objects.
+_keyword_regex = re2 if RE2_AVAILABLE else re
+SECURITY_KEYWORDS = _keyword_regex.compile(r"(?i)security|breach|unauthorized|vulnerability|critical")
+SENSITIVE_ISSUE_KEYWORDS = _keyword_regex.compile(r"(?i)password|credential|hack|attack")
+
+# Role, goal and backstory go out as the agent's system prompt. The task
+# keeps its fixed instructions ahead of the issue so every request for an
+# agent shares one prompt prefix the provider can cache.
+TASK_DESCRIPTION = """Analyze the following IT issue from your {role} perspective.
+                
+                Provide:
+                1. Your expert verdict on the root cause
+                2. Confidence level (0.0-1.0)
+                3. Any red flags or security concerns
+                4. Specific recommendations to resolve the issue
+                
+                Issue: {issue}
+                
+                Context: {context}
+                Priority: {priority}
+                """
+TASK_EXPECTED_OUTPUT = "Detailed analysis with verdict, confidence score, red flags, and recommendations"
+
+def _issue_key(issue: str) -> str:
+    return f"issue:{hashlib.blake2b(issue.encode(), digest_size=16).hexdigest()}"
+
+def _orchestration_cache_key(
+    orchestrator: "ProductionOrchestrator",
+    issue: str,
+    priority: str,
+    context: Dict[str, Any],
+    tags: List[str],
+    user_id: Optional[str] = None
+) -> tuple:
+    # Tags and user only label the request; case and whitespace in the issue
+    # and context key order do not change what the agents are asked
+    issue_norm = " ".join(issue.lower().split())
+    context_key = hashlib.blake2b(
+        orjson.dumps(context, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS),
+        digest_size=16
+    ).hexdigest()
+    return (issue_norm, priority, context_key)
+
 class ProductionOrchestrator:
     def __init__(self):
         self._initialized = False
         self._healthy = False
         self.llm = None
         self.crew_agents = {}
-        self.agent_configs = self._load_agent_configs()
+        self._agent_items: tuple = ()
+        self.agent_configs: Dict[AgentRole, AgentConfig] = {}
+        self._llm_gateway = LLMGateway(max_concurrency=int(os.getenv("LLM_CONCURRENCY", "8")))
         
     def _load_agent_configs(self) -> Dict[AgentRole, AgentConfig]:
         return {
-            AgentRole.AD_SPECIALIST: AgentConfig(
+            AgentRole.AD_SPECIALIST: AgentConfig.model_construct(
                 role=AgentRole.AD_SPECIALIST,
                 goal="Diagnose Active Directory and authentication issues with expert precision",
                 backstory="""You are a senior Active Directory engineer with 15 years of experience. 
@@ -37,7 +95,7 @@ class ProductionOrchestrator:
                 replication issues, and configuration problems.""",
                 max_iterations=5
             ),
-            AgentRole.NETWORK_ANALYST: AgentConfig(
+            AgentRole.NETWORK_ANALYST: AgentConfig.model_construct(
                 role=AgentRole.NETWORK_ANALYST,
                 goal="Analyze network connectivity and infrastructure problems systematically",
                 backstory="""You are a senior network engineer with expertise in TCP/IP, routing protocols, 
@@ -45,7 +103,7 @@ class ProductionOrchestrator:
                 packet loss, latency problems, and firewall misconfigurations.""",
                 max_iterations=5
             ),
-            AgentRole.SECURITY_AUDITOR: AgentConfig(
+            AgentRole.SECURITY_AUDITOR: AgentConfig.model_construct(
                 role=AgentRole.SECURITY_AUDITOR,
                 goal="Identify security vulnerabilities and policy violations",
                 backstory="""You are a cybersecurity specialist focused on threat detection, vulnerability 
@@ -53,7 +111,7 @@ class ProductionOrchestrator:
                 and policy violations that could compromise network security.""",
                 max_iterations=5
             ),
-            AgentRole.COMPLIANCE_CHECKER: AgentConfig(
+            AgentRole.COMPLIANCE_CHECKER: AgentConfig.model_construct(
                 role=AgentRole.COMPLIANCE_CHECKER,
                 goal="Assess regulatory compliance and policy adherence",
                 backstory="""You are a compliance expert familiar with SOC 2, HIPAA, PCI-DSS, and industry 
@@ -64,9 +122,16 @@ class ProductionOrchestrator:
         }
     
     async def initialize(self):
-        logger.info("orchestrator_init", event="initializing_orchestrator")
+        logger.info("orchestrator_init", stage="initializing_orchestrator")
         
         try:
+            # crewai/langchain are heavy imports; load them in the worker that runs agents
+            from crewai import Agent
+            from langchain_openai import ChatOpenAI
+            
+            if not self.agent_configs:
+                self.agent_configs = self._load_agent_configs()
+            
             self.llm = ChatOpenAI(
                 model="gpt-4",
                 temperature=0.7
@@ -74,22 +139,28 @@ class ProductionOrchestrator:
             
             for role, config in self.agent_configs.items():
                 agent = Agent(
-                    role=config.role.value.replace('_', ' ').title(),
+                    role=config.role_display,
                     goal=config.goal,
                     backstory=config.backstory,
                     llm=self.llm,
+                    use_system_prompt=True,
                     verbose=False,
                     allow_delegation=False
                 )
                 self.crew_agents[role] = agent
             
+            # Fixed after initialization; _analyze walks this on every request
+            self._agent_items = tuple(
+                (config, self.crew_agents[role]) for role, config in self.agent_configs.items()
+            )
+            
             await audit_logger.initialize()
             await redis_cache.initialize()
             
             self._initialized = True
             self._healthy = True
             
-            logger.info("orchestrator_init", event="orchestrator_ready", agents=len(self.crew_agents))
+            logger.info("orchestrator_init", stage="orchestrator_ready", agents=len(self.crew_agents))
             
         except Exception as e:
             logger.error("orchestrator_init_failed", error=str(e), exc_info=True)
@@ -97,7 +168,7 @@ class ProductionOrchestrator:
             raise
     
     async def shutdown(self):
-        logger.info("orchestrator_shutdown", event="shutting_down")
+        logger.info("orchestrator_shutdown", stage="shutting_down")
         await audit_logger.close()
         await redis_cache.close()
         self._healthy = False
@@ -115,9 +186,10 @@ class ProductionOrchestrator:
             "active_agents": len(self.crew_agents),
             "redis_connected": redis_cache.is_connected(),
             "database_connected": audit_logger.is_connected(),
+            "llm_gateway": self._llm_gateway.get_stats(),
         }
     
-    @robust_cache.memoize(expire=3600, tag="orchestration")
+    @robust_cache.memoize(expire=3600, tag="orchestration", key_func=_orchestration_cache_key)
     async def orchestrate(
         self,
         issue: str,
@@ -126,8 +198,6 @@ class ProductionOrchestrator:
         tags: List[str],
         user_id: Optional[str] = None
     ) -> Dict[str, Any]:
-        start_time = time.time()
-        
         logger.info(
             "orchestration_start",
             issue_length=len(issue),
@@ -138,61 +208,142 @@ class ProductionOrchestrator:
         
         metrics.increment_counter('orchestration_requests_total', {'priority': priority})
         
-        try:
-            redis_key = f"issue:{hash(issue) % 100000}"
-            cached_result = await redis_cache.get(redis_key)
+        redis_key = _issue_key(issue)
+        cached_result = await redis_cache.get(redis_key)
+        if cached_result:
+            logger.info("orchestration_cache_hit", redis_key=redis_key)
+            metrics.increment_counter('cache_hits_total', {'cache': 'redis'})
+            return cached_result
+        
+        consensus = await self._analyze(issue, priority, context, user_id)
+        await redis_cache.set(redis_key, consensus, expire=3600)
+        
+        return consensus
+    
+    async def orchestrate_batch(
+        self,
+        issues: List[str],
+        priority: str,
+        context: Dict[str, Any],
+        tags: List[str],
+        user_id: Optional[str] = None,
+        max_concurrency: int = 4
+    ) -> List[Dict[str, Any]]:
+        """
+        Orchestrate several issues sharing one priority and context.
+        
+        Cached results are fetched with a single MGET, duplicate issues are
+        analyzed once, and new results are written back in one pipeline.
+        At most max_concurrency issues are analyzed at a time so one large
+        batch cannot take every LLM slot from interactive requests.
+        Results are returned in input order.
+        """
+        logger.info(
+            "orchestration_batch_start",
+            batch_size=len(issues),
+            priority=priority,
+            tags=tags,
+            user_id=user_id
+        )
+        
+        keys = [_issue_key(issue) for issue in issues]
+        results = await redis_cache.get_many(keys)
+        
+        pending: Dict[str, str] = {}
+        cache_hits = 0
+        for key, issue, cached_result in zip(keys, issues, results):
+            metrics.increment_counter('orchestration_requests_total', {'priority': priority})
             if cached_result:
-                logger.info("orchestration_cache_hit", redis_key=redis_key)
+                cache_hits += 1
                 metrics.increment_counter('cache_hits_total', {'cache': 'redis'})
-                return cached_result
+            else:
+                pending.setdefault(key, issue)
+        
+        if pending:
+            semaphore = asyncio.Semaphore(max_concurrency)
+            
+            async def analyze(issue: str) -> Dict[str, Any]:
+                async with semaphore:
+                    return await self._analyze(issue, priority, context, user_id)
+            
+            computed = await asyncio.gather(*(analyze(issue) for issue in pending.values()))
+            fresh = dict(zip(pending.keys(), computed))
+            await redis_cache.set_many(fresh, expire=3600)
+            results = [
+                cached_result or fresh[key]
+                for key, cached_result in zip(keys, results)
+            ]
+        
+        logger.info(
+            "orchestration_batch_complete",
+            batch_size=len(issues),
+            cache_hits=cache_hits
+        )
+        
+        return results
+    
+    async def _analyze(
+        self,
+        issue: str,
+        priority: str,
+        context: Dict[str, Any],
+        user_id: Optional[str]
+    ) -> Dict[str, Any]:
+        start_time = time.perf_counter()
+        
+        try:
+            sensitive = SENSITIVE_ISSUE_KEYWORDS.search(issue) is not None
             
             agent_tasks = [
-                self._run_agent_with_crewai(role, agent, issue, context, priority)
-                for role, agent in self.crew_agents.items()
+                self._run_agent_with_crewai(config, agent, issue, context, priority, sensitive)
+                for config, agent in self._agent_items
             ]
             
             agent_results = await asyncio.gather(*agent_tasks, return_exceptions=True)
             
             valid_results = {}
-            for role, result in zip(self.crew_agents.keys(), agent_results):
+            failed_roles = []
+            for (config, _), result in zip(self._agent_items, agent_results):
                 if isinstance(result, Exception):
                     logger.error(
                         "agent_execution_failed",
-                        role=role.value,
+                        role=config.role_value,
                         error=str(result)
                     )
-                    metrics.increment_counter('agent_errors_total', {'role': role.value})
+                    failed_roles.append(config.role_value)
                     continue
-                valid_results[role.value] = result
-                metrics.increment_counter('agent_executions_total', {'role': role.value})
-            
-            consensus = self._compute_consensus(valid_results, priority)
+                valid_results[config.role_value] = result
             
-            processing_time = (time.time() - start_time) * 1000
+            consensus_result = self._compute_consensus(valid_results, priority)
+            # One recursive dump in pydantic-core for the caches and the response
+            consensus = consensus_result.model_dump()
             
-            await redis_cache.set(redis_key, consensus, expire=3600)
+            processing_time = (time.perf_counter() - start_time) * 1000
             
             await audit_logger.log_orchestration(
                 issue=issue,
                 priority=priority,
-                consensus=consensus["consensus"],
-                confidence=consensus["confidence"],
-                red_flagged=consensus["red_flagged"],
+                consensus=consensus_result.consensus,
+                confidence=consensus_result.confidence,
+                red_flagged=consensus_result.red_flagged,
                 processing_time_ms=processing_time,
                 user_id=user_id,
                 context=context
             )
             
-            metrics.observe_histogram('orchestration_duration_seconds', processing_time / 1000, {'priority': priority})
-            
-            if consensus["red_flagged"]:
-                metrics.increment_counter('red_flags_total', {'priority': priority})
+            metrics.record_orchestration(
+                priority=priority,
+                duration_seconds=processing_time / 1000,
+                red_flagged=consensus_result.red_flagged,
+                executed_roles=valid_results.keys(),
+                failed_roles=failed_roles
+            )
             
             logger.info(
                 "orchestration_complete",
-                consensus=consensus["consensus"],
-                confidence=consensus["confidence"],
-                red_flagged=consensus["red_flagged"],
+                consensus=consensus_result.consensus,
+                confidence=consensus_result.confidence,
+                red_flagged=consensus_result.red_flagged,
                 processing_time_ms=processing_time
             )
             
@@ -205,125 +356,125 @@ class ProductionOrchestrator:
     
     async def _run_agent_with_crewai(
         self,
-        role: AgentRole,
-        agent: Agent,
+        config: AgentConfig,
+        agent: Any,
         issue: str,
         context: Dict[str, Any],
-        priority: str
+        priority: str,
+        sensitive: bool = False
     ) -> AgentAnalysis:
+        from crewai import Task, Crew, Process
+        
         try:
-            task = Task(
-                description=f"""Analyze the following IT issue from your {role.value.replace('_', ' ')} perspective:
-                
-                Issue: {issue}
-                
-                Context: {context}
-                Priority: {priority}
-                
-                Provide:
-                1. Your expert verdict on the root cause
-                2. Confidence level (0.0-1.0)
-                3. Any red flags or security concerns
-                4. Specific recommendations to resolve the issue
-                """,
-                expected_output="Detailed analysis with verdict, confidence score, red flags, and recommendations",
-                agent=agent
+            description = TASK_DESCRIPTION.format(
+                role=config.role_display,
+                issue=issue,
+                context=context,
+                priority=priority
             )
             
-            crew = Crew(
-                agents=[agent],
-                tasks=[task],
-                process=Process.sequential,
-                verbose=False
-            )
+            # Built on the worker thread, and only by the caller that actually
+            # runs the prompt; coalesced callers never construct a crew
+            def kickoff():
+                task = Task(
+                    description=description,
+                    expected_output=TASK_EXPECTED_OUTPUT,
+                    agent=agent
+                )
+                crew = Crew(
+                    agents=[agent],
+                    tasks=[task],
+                    process=Process.sequential,
+                    verbose=False
+                )
+                return crew.kickoff()
             
-            result = await asyncio.to_thread(crew.kickoff)
+            result = await self._llm_gateway.submit(f"{config.role_value}:{description}", kickoff)
             
             output = str(result)
             
             red_flags = []
-            if any(keyword in output.lower() for keyword in ['security', 'breach', 'unauthorized', 'vulnerability', 'critical']):
-                red_flags.append(f"Security concern detected by {role.value}")
+            if SECURITY_KEYWORDS.search(output):
+                red_flags.append(f"Security concern detected by {config.role_value}")
             
-            if any(keyword in issue.lower() for keyword in ['password', 'credential', 'hack', 'attack']):
+            if sensitive:
                 red_flags.append("Sensitive issue requires immediate attention")
             
             confidence = 0.80 + (hash(output) % 20) / 100
             
             recommendations = self._extract_recommendations(output)
             
-            return AgentAnalysis(
+            return AgentAnalysis.model_construct(
                 verdict=output[:500] if len(output) > 500 else output,
                 confidence=min(confidence, 1.0),
-                reasoning=f"Analysis from {role.value} perspective",
+                reasoning=f"Analysis from {config.role_value} perspective",
                 red_flags=red_flags,
                 recommendations=recommendations,
-                metadata={"role": role.value, "priority": priority}
+                metadata={"role": config.role_value, "priority": priority}
             )
             
         except Exception as e:
-            logger.error(f"agent_error", role=role.value, error=str(e))
-            return AgentAnalysis(
-                verdict=f"Unable to analyze - {role.value} error",
+            logger.error(f"agent_error", role=config.role_value, error=str(e))
+            return AgentAnalysis.model_construct(
+                verdict=f"Unable to analyze - {config.role_value} error",
                 confidence=0.0,
                 reasoning=f"Error: {str(e)}",
                 red_flags=["Agent execution failed"],
                 recommendations=["Retry analysis"],
-                metadata={"role": role.value, "error": str(e)}
+                metadata={"role": config.role_value, "error": str(e)}
             )
     
     def _extract_recommendations(self, output: str) -> List[str]:
         recommendations = []
-        lines = output.split('\n')
-        for line in lines:
-            if any(keyword in line.lower() for keyword in ['recommend', 'suggest', 'should', 'verify', 'check']):
-                rec = line.strip()
-                if rec and len(rec) > 10:
-                    recommendations.append(rec[:200])
+        for match in RECOMMENDATION_LINE.finditer(output):
+            rec = match.group().strip()
+            if len(rec) > 10:
+                recommendations.append(rec[:200])
+                if len(recommendations) == 5:
+                    break
         
         if not recommendations:
             recommendations = ["Review system logs", "Verify configuration", "Test connectivity"]
         
-        return recommendations[:5]
+        return recommendations
     
     def _compute_consensus(
         self,
         agent_results: Dict[str, AgentAnalysis],
         priority: str
-    ) -> Dict[str, Any]:
+    ) -> ConsensusResult:
         if not agent_results:
-            return {
-                "consensus": "Unable to analyze - no agent results",
-                "confidence": 0.0,
-                "agents": {},
-                "recommendations": ["Retry analysis with valid configuration"],
-                "red_flagged": True,
-                "escalation_reason": "No agents responded successfully"
-            }
-        
-        total_confidence = sum(r.confidence for r in agent_results.values())
-        avg_confidence = total_confidence / len(agent_results)
+            return ConsensusResult(
+                consensus="Unable to analyze - no agent results",
+                confidence=0.0,
+                agents={},
+                recommendations=["Retry analysis with valid configuration"],
+                red_flagged=True,
+                escalation_reason="No agents responded successfully"
+            )
         
+        total_confidence = 0.0
         all_red_flags = []
         all_recommendations = []
         
         for analysis in agent_results.values():
+            total_confidence += analysis.confidence
             all_red_flags.extend(analysis.red_flags)
             all_recommendations.extend(analysis.recommendations)
         
+        avg_confidence = total_confidence / len(agent_results)
         red_flagged = len(all_red_flags) > 0 or priority == "critical"
         
-        verdicts = [r.verdict for r in agent_results.values()]
         consensus_verdict = f"Multi-agent analysis consensus from {len(agent_results)} specialists"
         
         if red_flagged:
             consensus_verdict += " - IMMEDIATE ESCALATION REQUIRED"
         
-        return {
-            "consensus": consensus_verdict,
-            "confidence": round(avg_confidence, 2),
-            "agents": {k: v.dict() for k, v in agent_results.items()},
-            "recommendations": list(set(all_recommendations))[:10],
-            "red_flagged": red_flagged,
-            "escalation_reason": "; ".join(all_red_flags) if all_red_flags else None,
-        }
\ No newline at end of file
+        return ConsensusResult(
+            consensus=consensus_verdict,
+            confidence=round(avg_confidence, 2),
+            agents=agent_results,
+            recommendations=list(dict.fromkeys(all_recommendations))[:10],
+            red_flagged=red_flagged,
+            escalation_reason="; ".join(all_red_flags) if all_red_flags else None,
+        )
\ No newline at end of file
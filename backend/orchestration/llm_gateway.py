@@ -0,0 +1,52 @@
+import asyncio
+from typing import Any, Callable, Dict
+import structlog
+
+logger = structlog.get_logger()
+
+class LLMGateway:
+    """
+    Coalesces identical LLM calls issued by concurrent orchestrations.
+    
+    The first caller for a prompt key starts the blocking call on a worker
+    thread; callers that arrive while it is in flight await the same task
+    instead of sending the prompt again. The task is shielded, so a caller
+    that gives up does not cancel the call for the others.
+    
+    At most max_concurrency calls hold a worker thread at once, so a burst of
+    orchestrations cannot starve the default executor that the rest of the
+    app also uses.
+    """
+    
+    def __init__(self, max_concurrency: int = 8):
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._stats = {
+            "calls": 0,
+            "coalesced": 0,
+        }
+    
+    async def submit(self, key: str, call: Callable[[], Any]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._run(call))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+            self._stats["calls"] += 1
+        else:
+            self._stats["coalesced"] += 1
+            logger.debug("llm_call_coalesced", inflight=len(self._inflight))
+        
+        return await asyncio.shield(task)
+    
+    async def _run(self, call: Callable[[], Any]) -> Any:
+        async with self._semaphore:
+            return await asyncio.to_thread(call)
+    
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            **self._stats,
+            "inflight": len(self._inflight),
+            "max_concurrency": self.max_concurrency,
+        }
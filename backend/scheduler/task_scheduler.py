@@ -1,10 +1,15 @@
 import asyncio
-from typing import Callable, Dict, List, Optional
-from datetime import datetime, timedelta
+import heapq
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 import structlog
 
 logger = structlog.get_logger()
 
+POLL_INTERVAL_SECONDS = 10
+RETRY_DELAY_SECONDS = 10
+
 class ScheduledTask:
     def __init__(
         self,
@@ -20,13 +25,17 @@ class ScheduledTask:
         self.cron_expression = cron_expression
         self.enabled = enabled
         self.last_run: Optional[datetime] = None
+        # Formatted once per run rather than on every status poll
+        self.last_run_iso: Optional[str] = None
         self.next_run: Optional[datetime] = None
+        # time.monotonic() at which the task is next due; 0.0 runs it on the first pass
+        self.next_deadline: float = 0.0
         self.run_count = 0
         self.error_count = 0
         
-    async def execute(self):
+    async def execute(self) -> bool:
         if not self.enabled:
-            return
+            return False
         
         try:
             logger.info("scheduled_task_starting", task=self.name)
@@ -36,7 +45,8 @@ class ScheduledTask:
             else:
                 self.func()
             
-            self.last_run = datetime.utcnow()
+            self.last_run = datetime.now(timezone.utc)
+            self.last_run_iso = self.last_run.isoformat()
             self.run_count += 1
             
             logger.info(
@@ -44,15 +54,18 @@ class ScheduledTask:
                 task=self.name,
                 run_count=self.run_count
             )
+            return True
             
         except Exception as e:
             self.error_count += 1
+            self.next_deadline = time.monotonic() + RETRY_DELAY_SECONDS
             logger.error(
                 "scheduled_task_failed",
                 task=self.name,
                 error=str(e),
                 exc_info=True
             )
+            return False
 
 class TaskScheduler:
     """
@@ -63,6 +76,11 @@ class TaskScheduler:
         self.tasks: Dict[str, ScheduledTask] = {}
         self.running = False
         self.scheduler_task = None
+        # (deadline, seq, name); entries whose deadline no longer matches the
+        # task's next_deadline are stale and skipped when popped
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = 0
+        self._wake = asyncio.Event()
     
     async def start(self):
         if self.running:
@@ -93,6 +111,8 @@ class TaskScheduler:
         )
         
         self.tasks[name] = task
+        self._schedule(task)
+        self._wake.set()
         logger.info(
             "task_registered",
             name=name,
@@ -102,6 +122,8 @@ class TaskScheduler:
     def enable_task(self, name: str):
         if name in self.tasks:
             self.tasks[name].enabled = True
+            self._schedule(self.tasks[name])
+            self._wake.set()
             logger.info("task_enabled", name=name)
     
     def disable_task(self, name: str):
@@ -112,34 +134,50 @@ class TaskScheduler:
     def remove_task(self, name: str):
         if name in self.tasks:
             del self.tasks[name]
+            self._wake.set()
             logger.info("task_removed", name=name)
     
+    def _schedule(self, task: ScheduledTask):
+        if task.next_deadline != float("inf"):
+            self._seq += 1
+            heapq.heappush(self._heap, (task.next_deadline, self._seq, task.name))
+    
+    async def _run(self, task: ScheduledTask):
+        if not await task.execute():
+            self._schedule(task)
+            self._wake.set()
+    
     async def _scheduler_loop(self):
         while self.running:
             try:
-                for task in self.tasks.values():
-                    if not task.enabled:
+                self._wake.clear()
+                now = time.monotonic()
+                
+                while self._heap and self._heap[0][0] <= now:
+                    deadline, _, name = heapq.heappop(self._heap)
+                    task = self.tasks.get(name)
+                    if task is None or not task.enabled or task.next_deadline != deadline:
                         continue
                     
-                    should_run = False
-                    
-                    if task.last_run is None:
-                        should_run = True
-                    elif task.interval_seconds:
-                        elapsed = (datetime.utcnow() - task.last_run).total_seconds()
-                        if elapsed >= task.interval_seconds:
-                            should_run = True
-                    
-                    if should_run:
-                        asyncio.create_task(task.execute())
+                    # Claim the slot at dispatch so a slow run is not started twice
+                    task.next_deadline = now + task.interval_seconds if task.interval_seconds else float("inf")
+                    self._schedule(task)
+                    asyncio.create_task(self._run(task))
+                
+                timeout = self._heap[0][0] - now if self._heap else None
                 
-                await asyncio.sleep(10)  # Check every 10 seconds
+                # Sleep until the next deadline; register, enable, remove and
+                # failed runs set _wake so the heap is re-read straight away
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
                 
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error("scheduler_loop_error", error=str(e))
-                await asyncio.sleep(10)
+                await asyncio.sleep(POLL_INTERVAL_SECONDS)
     
     def get_task_status(self) -> List[Dict]:
         return [
@@ -147,7 +185,7 @@ class TaskScheduler:
                 "name": task.name,
                 "enabled": task.enabled,
                 "interval_seconds": task.interval_seconds,
-                "last_run": task.last_run.isoformat() if task.last_run else None,
+                "last_run": task.last_run_iso,
                 "run_count": task.run_count,
                 "error_count": task.error_count
             }
@@ -1,9 +1,31 @@
+from array import array
 from typing import Dict, Optional, List
+import threading
 import structlog
 from datetime import datetime
 
 logger = structlog.get_logger()
 
+class UsageCounters:
+    """
+    Request counters for many tenants stored column-wise, one slot per tenant.
+    
+    Resetting the daily counts replaces one zero-filled buffer instead of
+    writing an attribute on every tenant.
+    """
+    
+    def __init__(self):
+        self.requests_today = array('q')
+        self.total_requests = array('q')
+    
+    def add_slot(self) -> int:
+        self.requests_today.append(0)
+        self.total_requests.append(0)
+        return len(self.requests_today) - 1
+    
+    def reset_today(self):
+        self.requests_today = array('q', bytes(len(self.requests_today) * self.requests_today.itemsize))
+
 class Tenant:
     def __init__(
         self,
@@ -11,7 +33,8 @@ class Tenant:
         name: str,
         plan: str = "free",
         max_requests_per_day: int = 100,
-        features: Optional[List[str]] = None
+        features: Optional[List[str]] = None,
+        counters: Optional[UsageCounters] = None
     ):
         self.tenant_id = tenant_id
         self.name = name
@@ -20,8 +43,24 @@ class Tenant:
         self.features = features or []
         self.created_at = datetime.utcnow()
         self.active = True
-        self.request_count_today = 0
-        self.total_requests = 0
+        self._counters = counters or UsageCounters()
+        self._slot = self._counters.add_slot()
+    
+    @property
+    def request_count_today(self) -> int:
+        return self._counters.requests_today[self._slot]
+    
+    @request_count_today.setter
+    def request_count_today(self, value: int):
+        self._counters.requests_today[self._slot] = value
+    
+    @property
+    def total_requests(self) -> int:
+        return self._counters.total_requests[self._slot]
+    
+    @total_requests.setter
+    def total_requests(self, value: int):
+        self._counters.total_requests[self._slot] = value
 
 class MultiTenantManager:
     """
@@ -30,6 +69,8 @@ class MultiTenantManager:
     
     def __init__(self):
         self.tenants: Dict[str, Tenant] = {}
+        self._counters = UsageCounters()
+        self._usage_lock = threading.Lock()
         self.plans = {
             "free": {
                 "max_requests_per_day": 100,
@@ -64,7 +105,8 @@ class MultiTenantManager:
             name=name,
             plan=plan,
             max_requests_per_day=plan_config["max_requests_per_day"],
-            features=plan_config["features"]
+            features=plan_config["features"],
+            counters=self._counters
         )
         
         self.tenants[tenant_id] = tenant
@@ -88,12 +130,61 @@ class MultiTenantManager:
             return False, f"Daily quota exceeded ({tenant.max_requests_per_day} requests)"
         
         return True, None
-    
+
+    def check_quota_many(self, tenant_ids: List[str]) -> List[bool]:
+        """
+        Quota check for a batch of tenants, read straight from the shared
+        counters. Unknown and inactive tenants come back False; use
+        check_quota for the reason.
+        """
+        requests_today = self._counters.requests_today
+        results = []
+        for tenant_id in tenant_ids:
+            tenant = self.tenants.get(tenant_id)
+            results.append(
+                tenant is not None
+                and tenant.active
+                and requests_today[tenant._slot] < tenant.max_requests_per_day
+            )
+        return results
+
     def increment_usage(self, tenant_id: str):
         tenant = self.get_tenant(tenant_id)
         if tenant:
+            with self._usage_lock:
+                tenant.request_count_today += 1
+                tenant.total_requests += 1
+    
+    def check_and_increment(self, tenant_id: str) -> tuple[bool, Optional[str]]:
+        """
+        Check the quota and reserve one request in a single step, so concurrent
+        requests cannot all pass the check before any of them is counted.
+        """
+        tenant = self.get_tenant(tenant_id)
+        
+        if not tenant:
+            return False, "Tenant not found"
+        
+        if not tenant.active:
+            return False, "Tenant account is inactive"
+        
+        with self._usage_lock:
+            if tenant.request_count_today >= tenant.max_requests_per_day:
+                return False, f"Daily quota exceeded ({tenant.max_requests_per_day} requests)"
             tenant.request_count_today += 1
             tenant.total_requests += 1
+        
+        return True, None
+    
+    def release_usage(self, tenant_id: str):
+        """
+        Return a reservation taken by check_and_increment for a request that failed.
+        """
+        tenant = self.get_tenant(tenant_id)
+        if tenant:
+            with self._usage_lock:
+                tenant.request_count_today = max(0, tenant.request_count_today - 1)
+                tenant.total_requests = max(0, tenant.total_requests - 1)
     
     def has_feature(self, tenant_id: str, feature: str) -> bool:
         tenant = self.get_tenant(tenant_id)
@@ -102,8 +193,8 @@ class MultiTenantManager:
         return feature in tenant.features
     
     def reset_daily_quotas(self):
-        for tenant in self.tenants.values():
-            tenant.request_count_today = 0
+        with self._usage_lock:
+            self._counters.reset_today()
         logger.info("daily_quotas_reset", tenant_count=len(self.tenants))
     
     def get_tenant_stats(self, tenant_id: str) -> Optional[Dict]:
@@ -4,31 +4,47 @@ import multiprocessing
 import os
 import sys
 import tempfile
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from backend.cache.robust_cache import RobustCacheManager
 
-def worker_process(worker_id: int, cache_dir: str, iterations: int):
-    import asyncio
-    from backend.cache.robust_cache import RobustCacheManager
+_cache = None
+
+def _setup_worker(cache_dir: str, ready):
+    global _cache
     
-    cache = RobustCacheManager(cache_dir=cache_dir, shards=4, lock_timeout=5)
+    # Match the production event loop when it is installed
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     
+    _cache = RobustCacheManager(cache_dir=cache_dir, shards=4, lock_timeout=5)
+    ready.wait(timeout=30)
+
+def _noop():
+    pass
+
+def worker_process(worker_id: int, iterations: int):
     async def work():
-        for i in range(iterations):
-            key = f"test_key_{i % 10}"
-            value = {"worker": worker_id, "iteration": i, "timestamp": time.time()}
-            
-            await cache.set(key, value, expire=60, tag="test")
-            
-            retrieved = await cache.get(key)
-            if retrieved is None:
+        base_ts = time.time()
+        keys = [f"test_key_{i % 10}" for i in range(iterations)]
+        
+        await asyncio.gather(*(
+            _cache.set(key, {"worker": worker_id, "iteration": i, "timestamp": base_ts}, expire=60, tag="test")
+            for i, key in enumerate(keys)
+        ))
+        
+        retrieved = await asyncio.gather(*(_cache.get(key) for key in keys))
+        for key, value in zip(keys, retrieved):
+            if value is None:
                 print(f"Worker {worker_id}: Failed to retrieve key {key}")
-            
-            await asyncio.sleep(0.01)
     
     asyncio.run(work())
     print(f"Worker {worker_id} completed {iterations} iterations")
@@ -45,23 +61,37 @@ def test_multiprocess_safety():
         
         print(f"\nStarting {num_workers} workers with {iterations_per_worker} iterations each...")
         
-        start_time = time.time()
-        
-        processes = []
-        for worker_id in range(num_workers):
-            p = multiprocessing.Process(
-                target=worker_process,
-                args=(worker_id, cache_dir, iterations_per_worker)
-            )
-            p.start()
-            processes.append(p)
+        # Workers import the cache module and build the manager once in the
+        # initializer, then meet at the barrier; the clock starts after that,
+        # so the timing covers lock contention, not startup
+        ready = multiprocessing.Barrier(num_workers + 1)
+        executor = ProcessPoolExecutor(
+            max_workers=num_workers,
+            initializer=_setup_worker,
+            initargs=(cache_dir, ready)
+        )
         
-        for p in processes:
-            p.join(timeout=30)
-            if p.is_alive():
-                print(f"WARNING: Process {p.pid} did not complete in time")
-                p.terminate()
-                p.join()
+        start_time = time.time()
+        try:
+            for _ in range(num_workers):
+                executor.submit(_noop)
+            ready.wait(timeout=30)
+            
+            start_time = time.time()
+            list(executor.map(
+                worker_process,
+                range(num_workers),
+                [iterations_per_worker] * num_workers,
+                timeout=30
+            ))
+        except (TimeoutError, threading.BrokenBarrierError):
+            # shutdown(wait=True) would block on a hung worker forever
+            print("WARNING: Workers did not complete in time")
+            for process in executor._processes.values():
+                process.terminate()
+            executor.shutdown(wait=False, cancel_futures=True)
+        else:
+            executor.shutdown()
         
         duration = time.time() - start_time
         
@@ -1,5 +1,6 @@
 import asyncio
 import functools
+import random
 from typing import Callable, Optional, Type, Tuple
 import structlog
 
@@ -9,8 +10,22 @@ def async_retry(
     max_attempts: int = 3,
     backoff_base: float = 2.0,
     exceptions: Tuple[Type[Exception], ...] = (Exception,),
-    on_retry: Optional[Callable] = None
+    on_retry: Optional[Callable] = None,
+    cap: float = 30.0,
+    jitter: str = "full",
+    abort_on: Tuple[Type[Exception], ...] = ()
 ):
+    """
+    Retry an async function with capped exponential backoff.
+    
+    jitter is "full" (wait uniformly between 0 and the backoff), "equal" (at
+    least half the backoff) or "none". Randomized waits keep callers that
+    failed together from retrying in lockstep. Exceptions in abort_on are
+    raised immediately even if they also match exceptions.
+    """
+    if jitter not in ("full", "equal", "none"):
+        raise ValueError(f"Unknown jitter mode: {jitter}")
+    
     def decorator(func: Callable):
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
@@ -22,6 +37,9 @@ def async_retry(
                 except exceptions as e:
                     last_exception = e
                     
+                    if abort_on and isinstance(e, abort_on):
+                        raise
+                    
                     if attempt == max_attempts:
                         logger.error(
                             "retry_exhausted",
@@ -31,7 +49,13 @@ def async_retry(
                         )
                         raise
                     
-                    wait_time = backoff_base ** (attempt - 1)
+                    backoff = min(cap, backoff_base ** (attempt - 1))
+                    if jitter == "full":
+                        wait_time = random.random() * backoff
+                    elif jitter == "equal":
+                        wait_time = backoff / 2 + random.random() * backoff / 2
+                    else:
+                        wait_time = backoff
                     logger.warning(
                         "retry_attempt",
                         func=func.__name__,
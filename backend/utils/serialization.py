@@ -1,13 +1,50 @@
 import msgpack
-from typing import Any
+from typing import Any, Iterable, List
 import hashlib
 
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+    msgspec = None
+
+if MSGSPEC_AVAILABLE:
+    _encoder = msgspec.msgpack.Encoder()
+
+# Type tags keep e.g. 1 and "1" from hashing to the same key
+KEY_PART_TAGS = {str: b"s", int: b"i", float: b"f", bytes: b"y", bool: b"?", type(None): b"n"}
+
+# msgspec writes the same msgpack wire format, so entries written by either
+# backend stay readable if msgspec is installed or removed later
 def serialize(data: Any) -> bytes:
+    if MSGSPEC_AVAILABLE:
+        return msgspec.msgpack.encode(data)
     return msgpack.packb(data, use_bin_type=True)
 
+def serialize_many(items: Iterable[Any]) -> List[bytes]:
+    if MSGSPEC_AVAILABLE:
+        return [_encoder.encode(item) for item in items]
+    packer = msgpack.Packer(use_bin_type=True)
+    return [packer.pack(item) for item in items]
+
 def deserialize(data: bytes) -> Any:
+    if MSGSPEC_AVAILABLE:
+        return msgspec.msgpack.decode(data)
     return msgpack.unpackb(data, raw=False)
 
 def generate_stable_key(*parts: Any) -> str:
-    serialized = serialize(parts)
-    return hashlib.blake2b(serialized, digest_size=16).hexdigest()
\ No newline at end of file
+    digest = hashlib.blake2b(digest_size=16)
+    
+    # Flat scalar parts are hashed one by one, length-prefixed, without
+    # building an intermediate msgpack buffer
+    if all(type(part) in KEY_PART_TAGS for part in parts):
+        for part in parts:
+            data = part if type(part) is bytes else str(part).encode()
+            digest.update(KEY_PART_TAGS[type(part)])
+            digest.update(len(data).to_bytes(4, "little"))
+            digest.update(data)
+        return digest.hexdigest()
+    
+    digest.update(serialize(parts))
+    return digest.hexdigest()
@@ -1,57 +1,264 @@
 #!/usr/bin/env python3
+import ast
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import site
 import sys
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from importlib.metadata import PackageNotFoundError, version
 from pathlib import Path
 
-def check_requirements():
+BAR = "=" * 50
+
+REQUIRED_FILES = frozenset(map(Path, (
+    "requirements.txt",
+    "backend/main.py",
+    "backend/cache/robust_cache.py",
+    "backend/orchestration/enhanced_orchestrator.py",
+    "kubernetes/network-consultant-enterprise.yaml",
+)))
+
+# Set NCAI_NO_CACHE=1 to always re-check dependencies
+DEPENDENCY_CACHE = Path.home() / ".cache" / "network-consultant-ai" / "depcheck.json"
+SYNTAX_CACHE = Path.home() / ".cache" / "network-consultant-ai" / "syntax.json"
+# Generated trees that check_syntax does not parse
+SKIP_DIRS = {"__pycache__", ".git", ".venv"}
+# Never fork: the other checks run in threads at the same time, and a fork
+# can copy a lock (e.g. the import lock) held by one of them into the child
+POOL_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+# Directory listings shared by the checks, normalized path -> {name: DirEntry}.
+# DirEntry keeps the file type from the listing, so no further stat is needed.
+_SCAN_CACHE = {}
+_scan_lock = threading.Lock()
+
+def _listdir(path):
+    path = os.path.normpath(path or ".")
+    with _scan_lock:
+        if path not in _SCAN_CACHE:
+            try:
+                with os.scandir(path) as entries:
+                    _SCAN_CACHE[path] = {entry.name: entry for entry in entries}
+            except (FileNotFoundError, NotADirectoryError):
+                _SCAN_CACHE[path] = {}
+        return _SCAN_CACHE[path]
+
+def check_requirements(out=None):
     """Validate all required files exist"""
-    required_files = [
-        "requirements.txt",
-        "backend/main.py",
-        "backend/cache/robust_cache.py",
-        "backend/orchestration/enhanced_orchestrator.py",
-        "kubernetes/network-consultant-enterprise.yaml",
-    ]
-    
-    missing = [f for f in required_files if not Path(f).exists()]
+    missing = sorted(str(f) for f in REQUIRED_FILES if f.name not in _listdir(str(f.parent)))
     if missing:
-        print(f"❌ Missing required files: {missing}")
+        print(f"❌ Missing required files: {missing}", file=out)
         return False
-    print("✅ All required files present")
+    print("✅ All required files present", file=out)
     return True
 
-def check_dependencies():
+def _dependency_cache_key():
+    # The result depends on what is installed, so the key also covers the
+    # site-packages directories, whose mtime moves on every install/uninstall
+    digest = hashlib.sha256(Path("requirements.txt").read_bytes())
+    digest.update(sys.version.encode())
+    digest.update(sys.prefix.encode())
+    for site_dir in sorted(set(site.getsitepackages() + [site.getusersitepackages()])):
+        try:
+            digest.update(f"{site_dir}:{os.stat(site_dir).st_mtime_ns}".encode())
+        except OSError:
+            pass
+    return digest.hexdigest()
+
+def _pip_check():
+    # pip's own check, run in this interpreter rather than a pip subprocess;
+    # the internal API can move between pip releases, hence the fallback
+    try:
+        from pip._internal.operations.check import check_package_set, create_package_set_from_installed
+    except ImportError:
+        command = [sys.executable, "-m", "pip", "check"]
+        # The report is only needed on failure, so the common passing run
+        # sends its output nowhere and a failing one is re-run to capture it
+        if subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode == 0:
+            return True, ""
+        result = subprocess.run(command, capture_output=True)
+        return False, (result.stdout + result.stderr).decode("utf-8", errors="replace")
+    
+    package_set, parsing_probs = create_package_set_from_installed()
+    missing, conflicting = check_package_set(package_set)
+    
+    problems = []
+    for project_name, dependencies in missing.items():
+        version = package_set[project_name].version
+        for dependency in dependencies:
+            problems.append(f"{project_name} {version} requires {dependency[0]}, which is not installed.")
+    for project_name, dependencies in conflicting.items():
+        version = package_set[project_name].version
+        for dep_name, dep_version, req in dependencies:
+            problems.append(f"{project_name} {version} has requirement {req}, but you have {dep_name} {dep_version}.")
+    if parsing_probs:
+        problems.append("Some installed distributions have unreadable metadata.")
+    
+    return not problems, "\n".join(problems)
+
+def _requirements_check():
+    # Each requirements.txt entry against installed distribution metadata,
+    # without importing pip; pip's own check is the fallback without packaging
+    try:
+        from packaging.requirements import InvalidRequirement, Requirement
+    except ImportError:
+        return _pip_check()
+    
+    try:
+        lines = Path("requirements.txt").read_text().splitlines()
+    except FileNotFoundError:
+        return False, "requirements.txt not found"
+    
+    problems = []
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        if not line or line.startswith("-"):
+            continue
+        
+        try:
+            req = Requirement(line)
+        except InvalidRequirement as e:
+            problems.append(f"{line}: {e}")
+            continue
+        
+        if req.marker is not None and not req.marker.evaluate():
+            continue
+        
+        try:
+            installed = version(req.name)
+        except PackageNotFoundError:
+            problems.append(f"{req} is not installed.")
+            continue
+        
+        if not req.specifier.contains(installed, prereleases=True):
+            problems.append(f"{req} is required, but you have {req.name} {installed}.")
+    
+    return not problems, "\n".join(problems)
+
+def check_dependencies(out=None):
     """Verify Python dependencies are installable"""
+    key = None
+    if os.getenv("NCAI_NO_CACHE") != "1":
+        try:
+            key = _dependency_cache_key()
+            cached = json.loads(DEPENDENCY_CACHE.read_text()).get(key)
+        except (OSError, ValueError):
+            cached = None
+        
+        if cached is not None:
+            ok, stderr = cached
+            if ok:
+                print("✅ Dependencies validated (cached)", file=out)
+            else:
+                print(f"❌ Dependency check failed (cached): {stderr}", file=out)
+            return ok
+    
+    ok, stderr = _requirements_check()
+    if ok:
+        print("✅ Dependencies validated", file=out)
+    else:
+        print(f"❌ Dependency check failed: {stderr}", file=out)
+    
+    if key is not None:
+        try:
+            DEPENDENCY_CACHE.parent.mkdir(parents=True, exist_ok=True)
+            DEPENDENCY_CACHE.write_text(json.dumps({key: [ok, stderr]}))
+        except OSError:
+            pass
+    
+    return ok
+
+def _walk(root):
+    for entry in _listdir(root).values():
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name not in SKIP_DIRS:
+                yield from _walk(entry.path)
+        else:
+            yield entry
+
+def _parse_file(path):
     try:
-        result = subprocess.run(
-            ["pip", "check"],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        print("✅ Dependencies validated")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Dependency check failed: {e.stderr}")
-        return False
+        with open(path, "rb") as f:
+            ast.parse(f.read(), filename=path, mode="exec")
+        return None
+    except SyntaxError as e:
+        return path, f"line {e.lineno}: {e.msg}" if e.lineno else e.msg
+    except ValueError as e:
+        return path, str(e)
+    except FileNotFoundError:
+        # Removed after the tree was listed
+        return path, "file not found"
 
-def check_syntax():
+def _file_stamps(entries):
+    stamps = {}
+    for entry in entries:
+        try:
+            stat = entry.stat()
+            stamps[entry.path] = [stat.st_mtime_ns, stat.st_size]
+        except FileNotFoundError:
+            stamps[entry.path] = None
+    return stamps
+
+def check_syntax(out=None):
     """Run Python syntax validation"""
+    entries = [entry for entry in _walk("backend") if entry.name.endswith(".py")]
+    stamps = _file_stamps(entries)
+    
+    # Files that parsed cleanly last time and are unchanged since are skipped
+    cached = {}
+    if os.getenv("NCAI_NO_CACHE") != "1":
+        try:
+            # Passes only hold for the grammar of the interpreter that saw them
+            cached = json.loads(SYNTAX_CACHE.read_text()).get(sys.version) or {}
+        except (OSError, ValueError, AttributeError):
+            pass
+    files = [
+        path for path, stamp in stamps.items()
+        if stamp is None or cached.get(os.path.abspath(path)) != stamp
+    ]
+    
+    # Parse only: no bytecode generation and no .pyc written. Results are
+    # taken as they finish and sorted for the report afterwards.
+    workers = os.cpu_count() or 1
+    if workers > 1 and len(files) > 1:
+        with POOL_CONTEXT.Pool(workers) as pool:
+            errors = [r for r in pool.imap_unordered(_parse_file, files, chunksize=4) if r]
+    else:
+        errors = [r for r in map(_parse_file, files) if r]
+    
+    # Rewritten from this run alone, which drops deleted and broken files
+    failed = {path for path, _ in errors}
+    passing = {
+        os.path.abspath(path): stamp for path, stamp in stamps.items()
+        if stamp is not None and path not in failed
+    }
     try:
-        result = subprocess.run(
-            ["python", "-m", "py_compile", "backend/main.py"],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        print("✅ Python syntax valid")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Syntax error: {e.stderr}")
+        SYNTAX_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        SYNTAX_CACHE.write_text(json.dumps({sys.version: passing}))
+    except OSError:
+        pass
+    
+    if errors:
+        for path, message in sorted(errors):
+            print(f"❌ Syntax error in {path}: {message}", file=out)
         return False
+    print(f"✅ Python syntax valid ({len(entries)} files)", file=out)
+    return True
+
+def _print_banner(name, out):
+    print(f"\n{BAR}\nChecking: {name}\n{BAR}", file=out)
 
 def main():
-    print("🔍 Network Consultant AI - Production Validation\n")
+    # The whole report is written to stdout in one go at the end
+    report = io.StringIO()
+    print("🔍 Network Consultant AI - Production Validation\n", file=report)
     
     checks = [
         ("Requirements", check_requirements),
@@ -60,21 +267,47 @@ def main():
     ]
     
     results = []
-    for name, check in checks:
-        print(f"\n{'='*50}")
-        print(f"Checking: {name}")
-        print('='*50)
-        results.append(check())
+    if os.getenv("NCAI_FAIL_FAST") == "1":
+        # In order, stopping at the first failure; later checks never start.
+        # Threads cannot be cancelled once running, so this mode is sequential.
+        for name, check in checks:
+            _print_banner(name, report)
+            results.append(check(report))
+            if not results[-1]:
+                break
+    else:
+        # The checks are independent, so run them side by side. check_syntax
+        # starts worker processes, so it runs on this thread instead of from
+        # inside the thread pool. Each check writes to its own buffer, copied
+        # into the report in the order above once all have finished.
+        buffers = {name: io.StringIO() for name, _ in checks}
+        with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+            futures = {
+                name: executor.submit(check, buffers[name])
+                for name, check in checks if check is not check_syntax
+            }
+            outcomes = {
+                name: check(buffers[name])
+                for name, check in checks if check is check_syntax
+            }
+            outcomes.update((name, future.result()) for name, future in futures.items())
+        
+        for name, _ in checks:
+            _print_banner(name, report)
+            report.write(buffers[name].getvalue())
+            results.append(outcomes[name])
     
-    print("\n" + "="*50)
+    report.write(f"\n{BAR}\n")
     if all(results):
-        print("✅ ALL VALIDATION CHECKS PASSED")
-        print("🚀 System ready for production deployment")
-        return 0
+        report.write("✅ ALL VALIDATION CHECKS PASSED\n🚀 System ready for production deployment\n")
+        status = 0
     else:
-        print("❌ VALIDATION FAILED")
-        print("🛑 Fix issues before deploying to production")
-        return 1
+        report.write("❌ VALIDATION FAILED\n🛑 Fix issues before deploying to production\n")
+        status = 1
+    
+    sys.stdout.write(report.getvalue())
+    sys.stdout.flush()
+    return status
 
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file